@@ -1,2 +1,27 @@
-from .managing import *
-from .expressions import *
+from pathex.adts.lazy import lazy_attributes
+
+# The modules are imported when their names are first used, so ``import pathex`` is cheap.
+__all__, __getattr__, __dir__ = lazy_attributes(__name__, {
+    '.managing.synchronizer': ['Synchronizer'],
+    '.managing.shared_synchronizer': ['SharedSynchronizer'],
+    '.managing.tag': ['Tag'],
+    '.managing.processes': ['get_mp_process_manager', 'SynchronizerProxy',
+                            'PipelinedSynchronizerProxy'],
+    '.managing.concurrent': ['Concurrent'],
+    '.managing.specification': ['Specification'],
+    '.managing.executor': ['SynchronizedExecutor'],
+    '.expressions.expression': ['Expression'],
+    '.expressions.nary_operators.concatenation': ['Concatenation'],
+    '.expressions.nary_operators.difference': ['Difference'],
+    '.expressions.nary_operators.intersection': ['Intersection'],
+    '.expressions.nary_operators.shuffle': ['Shuffle'],
+    '.expressions.nary_operators.union': ['Union'],
+    '.expressions.non_fundamentals': ['optional'],
+    '.expressions.repetitions.concatenation_repetition': ['ConcatenationRepetition'],
+    '.expressions.repetitions.shuffle_repetition': ['ShuffleRepetition'],
+    '.expressions.terms.term': ['Term'],
+    '.expressions.terms.alphabet': ['Alphabet', 'ALPHABET'],
+    '.expressions.terms.empty_word': ['EmptyWord', 'EMPTY_WORD'],
+    '.expressions.terms.letter': ['Letter'],
+    '.expressions.terms.letters_complement': ['LettersComplement'],
+})
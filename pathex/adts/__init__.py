@@ -1,4 +1,13 @@
-from .collection_wrapper import *
-from .containers import *
-from .singleton import *
-from .util import *
+from .lazy import lazy_attributes
+
+__all__, __getattr__, __dir__ = lazy_attributes(__name__, {
+    '.collection_wrapper': ['CollectionWrapper'],
+    '.containers.ordered_set': ['OrderedSet'],
+    '.containers.disk_queue': ['DiskQueue'],
+    '.containers.onion_collection': ['OnionCollection', 'EmptyOnionCollection',
+                                     'NonemptyOnionCollection'],
+    '.histogram': ['Histogram'],
+    '.lazy': ['lazy_attributes'],
+    '.singleton': ['singleton'],
+    '.util': ['take', 'get_head_tail', 'SET_OF_TUPLES', 'SET_OF_STRS'],
+})
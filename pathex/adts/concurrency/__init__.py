@@ -1 +1,2 @@
 from .counted_condition import *
+from .timed_lock import *
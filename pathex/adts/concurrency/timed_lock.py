@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from time import perf_counter
+
+from pathex.adts.histogram import Histogram
+
+__all__ = ['TimedLock']
+
+
+class TimedLock:
+    """A wrapper of a lock that measures how much time is spent waiting to acquire it, and how much time it is held.
+
+    .. testsetup::
+
+       from pathex.adts.concurrency.timed_lock import TimedLock
+
+    >>> import threading
+    >>> lock = TimedLock(threading.Lock())
+    >>> with lock:
+    ...     pass
+    >>> assert lock.wait_times.count == lock.hold_times.count == 1
+    """
+
+    def __init__(self, lock):
+        """
+        Args:
+            lock (Lock): The underlying lock.
+        """
+        self._lock = lock
+        self._acquired_at = 0.0
+        self.wait_times = Histogram()
+        self.hold_times = Histogram()
+
+    def acquire(self) -> bool:
+        start = perf_counter()
+        self._lock.acquire()
+        # the histograms are only modified while the lock is held
+        self._acquired_at = perf_counter()
+        self.wait_times.add(self._acquired_at - start)
+        return True
+
+    def release(self) -> None:
+        self.hold_times.add(perf_counter() - self._acquired_at)
+        self._lock.release()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *args) -> None:
+        self.release()
@@ -1,2 +1,8 @@
-from .ordered_set import *
-from .onion_collection import *
+from pathex.adts.lazy import lazy_attributes
+
+__all__, __getattr__, __dir__ = lazy_attributes(__name__, {
+    '.ordered_set': ['OrderedSet'],
+    '.disk_queue': ['DiskQueue'],
+    '.onion_collection': ['OnionCollection', 'EmptyOnionCollection',
+                          'NonemptyOnionCollection'],
+})
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import tempfile
+import weakref
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Collection, TypeVar
+
+__all__ = ['DiskQueue']
+
+_T = TypeVar('_T')
+
+# The ids are never reused, not even when every element was deleted, as the elements are read in order of id after the last one read.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY AUTOINCREMENT, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS checkpoint (popped INTEGER NOT NULL);
+"""
+
+
+def _close(connection: sqlite3.Connection, temporary: str | None) -> None:
+    connection.close()
+    if temporary is not None:
+        os.remove(temporary)
+
+
+class DiskQueue(Collection[_T]):
+    """A first-in first-out queue whose elements are kept in a :mod:`sqlite3` database file, so it may be larger than the memory. It has the interface of a :class:`~.CollectionWrapper`, so it may be used as the ``partial_words_type`` of :func:`~.words_generator`.
+
+    The elements are pickled. The ones put last and the ones to be popped next are kept in memory buffers of ``buffer_size`` elements, so the file is read and written in batches. Unlike the default collection of partial words, repeated elements are not discarded.
+
+    Every ``checkpoint_interval`` pops, and whenever :meth:`checkpoint` is called, the elements not popped yet are committed to the file before the next element is popped. If ``path`` is given, a queue constructed later with the same ``path`` contains the elements of the last checkpoint, so an interrupted generation may be resumed: :func:`~.words_generator` continues from the partial words of the checkpoint if its collection is not empty. The words given after the checkpoint are given again then. If ``path`` is :obj:`None`, a temporary file is used, which is removed when the queue is closed.
+
+    .. testsetup::
+
+       from pathex.adts.containers.disk_queue import DiskQueue
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'queue.db')
+    >>> q = DiskQueue(range(5), path, buffer_size=2)
+    >>> q.pop(), q.pop(), len(q), list(q)
+    (0, 1, 3, [2, 3, 4])
+    >>> q.checkpoint()
+    >>> q.pop()
+    2
+    >>> q.close()
+    >>> q = DiskQueue(path=path)
+    >>> list(q), 4 in q
+    ([2, 3, 4], True)
+    >>> while q:
+    ...     _ = q.pop()
+    >>> q.pop()
+    Traceback (most recent call last):
+        ...
+    IndexError: pop from empty DiskQueue
+    >>> q.close()
+
+    A generation with bounded memory, interrupted and resumed from the file:
+
+    >>> from itertools import islice
+    >>> from pathex.expressions.aliases import *
+    >>> from pathex.generation.eager import words_generator
+    >>> from pathex.machines.decomposers.extended_decomposer_compalphabet import ExtendedDecomposerCompalphabet
+    >>> exp = S(*'abcdef')
+    >>> path = os.path.join(tempfile.mkdtemp(), 'frontier.db')
+    >>> frontiers = []
+    >>> def frontier():
+    ...     frontiers.append(DiskQueue(path=path, buffer_size=100, checkpoint_interval=50))
+    ...     return frontiers[-1]
+    >>> words = {''.join(w) for w in islice(words_generator(exp, ExtendedDecomposerCompalphabet(), partial_words_type=frontier), 300)}
+    >>> frontiers[0].close()
+    >>> words |= {''.join(w) for w in words_generator(exp, ExtendedDecomposerCompalphabet(), partial_words_type=frontier)}
+    >>> assert words == exp.get_language()
+    >>> frontiers[1].close()
+    """
+    PopException = IndexError
+
+    def __init__(self, it: Iterable[_T] = (), path: str | os.PathLike | None = None,
+                 buffer_size: int = 10_000, checkpoint_interval: int = 100_000) -> None:
+        temporary = None
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.db')
+            os.close(fd)
+            temporary = path
+        self._connection = sqlite3.connect(path)
+        # the file is closed, and removed if it is temporary, also when the queue is garbage collected
+        self._close = weakref.finalize(self, _close, self._connection, temporary)
+        self._connection.executescript(_SCHEMA)
+        self._buffer_size = buffer_size
+        self._checkpoint_interval = checkpoint_interval
+        # the elements put and not written yet, and the ones read and not popped yet, with their ids
+        self._put: deque[_T] = deque()
+        self._read: deque[tuple[int, _T]] = deque()
+        row = self._connection.execute('SELECT popped FROM checkpoint').fetchone()
+        if row is None:
+            self._connection.execute('INSERT INTO checkpoint VALUES (0)')
+            self._connection.commit()
+            self._popped = 0
+        else:
+            self._popped, = row
+        # the id of the last element read from the file
+        self._last_read = self._popped
+        self._len, = self._connection.execute(
+            'SELECT COUNT(*) FROM items WHERE id > ?', (self._popped,)).fetchone()
+        self._pops = 0
+        self.extend(it)
+
+    def put(self, element: _T) -> None:
+        self._put.append(element)
+        self._len += 1
+        if len(self._put) >= self._buffer_size:
+            self._write()
+
+    def extend(self, it: Iterable[_T]) -> None:
+        for element in it:
+            self.put(element)
+
+    def pop(self) -> _T:
+        """Removes and gives the element that was put first."""
+        if self._pops >= self._checkpoint_interval:
+            self.checkpoint()
+        if not self._read:
+            self._write()
+            self._read.extend(
+                (i, pickle.loads(data)) for i, data in self._connection.execute(
+                    'SELECT id, data FROM items WHERE id > ? ORDER BY id LIMIT ?',
+                    (self._last_read, self._buffer_size)))
+            if not self._read:
+                raise IndexError(f'pop from empty {self.__class__.__name__}')
+            self._last_read = self._read[-1][0]
+        self._popped, element = self._read.popleft()
+        self._len -= 1
+        self._pops += 1
+        return element
+
+    def checkpoint(self) -> None:
+        """Commits the elements not popped yet to the file, so a queue constructed later with the same path will contain them."""
+        self._write()
+        self._connection.execute('DELETE FROM items WHERE id <= ?', (self._popped,))
+        self._connection.execute('UPDATE checkpoint SET popped = ?', (self._popped,))
+        self._connection.commit()
+        self._pops = 0
+
+    def close(self) -> None:
+        """Closes the file, discarding the changes after the last checkpoint, and removes it if it is temporary."""
+        self._close()
+
+    def _write(self) -> None:
+        if self._put:
+            self._connection.executemany(
+                'INSERT INTO items (data) VALUES (?)',
+                ((pickle.dumps(element, pickle.HIGHEST_PROTOCOL),) for element in self._put))
+            self._put.clear()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[_T]:
+        for _, element in self._read:
+            yield element
+        for data, in self._connection.execute(
+                'SELECT data FROM items WHERE id > ? ORDER BY id', (self._last_read,)):
+            yield pickle.loads(data)
+        yield from self._put
+
+    def __contains__(self, o: object) -> bool:
+        return any(element == o for element in self)
+
+    def __repr__(self):  # pragma: no cover
+        return f'{self.__class__.__name__}({len(self)} elements)'
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import sys
-from collections import deque
 from collections.abc import Collection, Iterator, Reversible
 from dataclasses import dataclass, field
 from typing import Generic, Iterable, TypeVar
@@ -42,6 +40,9 @@ class EmptyOnionCollection(OnionCollection[_E]):
 
     __reversed__ = __iter__
 
+    def as_list(self) -> list[_E]:
+        return []
+
     # def __hash__(self):
     #     pass
 
@@ -74,11 +75,9 @@ class NonemptyOnionCollection(OnionCollection[_E]):
     _hash: int = field(init=False, repr=False)
     _len: int = field(init=False, repr=False)
 
-    _HASH_BASE = 2
-    _MAX_NUMBER = sys.maxsize
-
     def __post_init__(self):
-        object.__setattr__(self, '_hash', hash(self.last) * self._power())
+        # the hash depends on every element, so collections that only share their last elements seldom collide
+        object.__setattr__(self, '_hash', hash((hash(self.parent), self.last)))
         object.__setattr__(self, '_len', len(self.parent) + 1)
 
     def __len__(self) -> int:
@@ -93,20 +92,36 @@ class NonemptyOnionCollection(OnionCollection[_E]):
         return get_it()
 
     def __iter__(self) -> Iterator[_E]:
-        l = deque()
-        for x in self.__reversed__():
-            l.appendleft(x)
-        return iter(l)
+        return iter(self.as_list())
+
+    def as_list(self) -> list[_E]:
+        """Gives the elements of the collection in a new list, which is cheaper than iterating over it.
+
+        .. testsetup::
+
+           from pathex.adts.containers.onion_collection import from_iterable
+
+        >>> from_iterable('abc').as_list()
+        ['a', 'b', 'c']
+        """
+        elements = []
+        current = self
+        while isinstance(current, NonemptyOnionCollection):
+            elements.append(current.last)
+            current = current.parent
+        elements.reverse()
+        return elements
 
     def __hash__(self) -> int:
         return self._hash
 
+    def __reduce__(self):
+        # the hash of the elements may be different in other processes, so it is computed again
+        return from_iterable, (tuple(self),)
+
     def __contains__(self, x: object) -> bool:
         for e in self.__reversed__():
             if e == x:
                 return True
 
         return False
-
-    def _power(self):
-        return pow(len(self.parent), self._HASH_BASE, self._MAX_NUMBER)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from math import frexp
+
+__all__ = ['Histogram']
+
+
+class Histogram:
+    """A histogram of durations, given in seconds, with logarithmic buckets.
+
+    Bucket ``0`` counts the values less than :attr:`BASE`, and bucket ``i > 0`` counts the values in ``[BASE*2**(i-1), BASE*2**i)``. The last bucket also counts all greater values.
+
+    .. testsetup::
+
+       from pathex.adts.histogram import Histogram
+
+    >>> h = Histogram()
+    >>> for value in (0, 1.5e-6, 3e-6, 3e-6, 1e-3):
+    ...     h.add(value)
+    >>> assert h.count == 5 and h.max == 1e-3
+    >>> assert h.buckets[:3] == [1, 1, 2]
+    >>> assert h.percentile(0.5) == 4e-6
+    >>> assert Histogram().percentile(0.5) == 0
+    """
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    BASE = 1e-6
+    LENGTH = 32
+
+    def __init__(self):
+        self.buckets = [0]*self.LENGTH
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        # the exponent of ``value/BASE`` is the index of its bucket
+        i = frexp(value / self.BASE)[1]
+        if i < 0:
+            i = 0
+        elif i >= self.LENGTH:
+            i = self.LENGTH - 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: Histogram) -> None:
+        """Adds the values of ``other`` to this histogram."""
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        """Gives an upper bound of the ``p``-th percentile, being ``p`` in ``[0, 1]``."""
+        if not self.count:
+            return 0
+        target = p * self.count
+        accumulated = 0
+        for i, n in enumerate(self.buckets):
+            accumulated += n
+            if accumulated >= target and n:
+                return min(self.BASE * 2**i, self.max)
+        return self.max  # pragma: no cover
+
+    def snapshot(self) -> dict[str, object]:
+        """Gives a :class:`dict` with the current values of the histogram."""
+        return {'count': self.count,
+                'total': self.total,
+                'max': self.max,
+                'p50': self.percentile(0.5),
+                'p90': self.percentile(0.9),
+                'p99': self.percentile(0.99),
+                'buckets': list(self.buckets)}
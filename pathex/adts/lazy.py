@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import importlib
+import sys
+from collections.abc import Callable, Iterable
+
+__doc__ = f"""
+
+Lazy attributes of packages
+===========================
+
+:Module: ``{__name__}``
+
+---------------------------------------------------------------
+
+This module allows packages to give the attributes of their modules without importing them until they are first used, as described in :pep:`562`. So importing a package does not import the dependencies of the parts of it that are not used.
+
+.. include:: ../non_essential_disclamer.txt
+"""
+
+__all__ = ['lazy_attributes']
+
+
+def lazy_attributes(package: str, exports: dict[str, Iterable[str]]) -> tuple[list[str], Callable[[str], object], Callable[[], list[str]]]:
+    """Gives the ``__all__``, ``__getattr__`` and ``__dir__`` of ``package``, whose attributes are the names given in ``exports`` for each of its modules. The modules are given relative to ``package``.
+
+    Each module is imported the first time one of its names is accessed, and the value is then stored in ``package``, so :pep:`562` ``__getattr__`` is not called again for that name. Submodules of ``package`` are imported too when they are accessed as attributes.
+
+    Use it at the end of the ``__init__`` module of a package:
+
+    .. code-block:: python
+
+       from pathex.adts.lazy import lazy_attributes
+
+       __all__, __getattr__, __dir__ = lazy_attributes(__name__, {
+           '.histogram': ['Histogram'],
+       })
+
+    .. testsetup::
+
+       from pathex.adts.lazy import lazy_attributes
+
+    >>> import sys, types
+    >>> package = types.ModuleType('package')
+    >>> sys.modules['package'] = package
+    >>> package.__all__, package.__getattr__, package.__dir__ = lazy_attributes(
+    ...     'package', {'collections': ['OrderedDict', 'deque']})
+    >>> package.__all__
+    ['OrderedDict', 'deque']
+    >>> assert 'deque' not in vars(package)
+    >>> from collections import deque
+    >>> assert package.deque is deque and vars(package)['deque'] is deque
+    >>> package.missing
+    Traceback (most recent call last):
+        ...
+    AttributeError: module 'package' has no attribute 'missing'
+    >>> del sys.modules['package']
+    """
+    modules = {name: module for module, names in exports.items()
+               for name in names}
+
+    def __getattr__(name: str) -> object:
+        try:
+            module = modules[name]
+        except KeyError:
+            if '__path__' in vars(sys.modules[package]):
+                try:
+                    return importlib.import_module(f'.{name}', package)
+                except ModuleNotFoundError as e:
+                    if e.name != f'{package}.{name}':
+                        raise
+            raise AttributeError(
+                f'module {package!r} has no attribute {name!r}') from None
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | modules.keys())
+
+    return list(modules), __getattr__, __dir__
@@ -0,0 +1,211 @@
+"""Runs the benchmarks of |pe|. Use ``python -m pathex.bench --help`` to see the available options."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterable
+
+from pathex.bench import imports, machines, synchronizer
+from pathex.bench.compare import BASELINES, compare, load, save
+
+
+def _get_ints(s: str) -> list[int]:
+    return [int(x) for x in s.split(',')]
+
+
+def _get_names(s: str, allowed: Iterable[str]) -> list[str]:
+    names = s.split(',')
+    for name in names:
+        if name not in allowed:
+            raise argparse.ArgumentTypeError(
+                f'{name!r} is not one of {", ".join(allowed)}')
+    return names
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m pathex.bench',
+        description='Runs the benchmarks of PathEx. The "sync" benchmarks are run if no command is given. Stored baselines are updated by writing the results with --json to the "baselines" directory of this package.')
+    subparsers = parser.add_subparsers(dest='command')
+
+    sync = subparsers.add_parser(
+        'sync', help='throughput and latency of synchronizers')
+    sync.add_argument('--scenarios', default=','.join(synchronizer.SCENARIOS),
+                      type=lambda s: _get_names(s, synchronizer.SCENARIOS),
+                      help='comma separated scenarios (default: %(default)s)')
+    sync.add_argument('--backends', default='thread,proxy',
+                      type=lambda s: _get_names(s, synchronizer.BACKENDS),
+                      help=f'comma separated backends among {", ".join(synchronizer.BACKENDS)} (default: %(default)s)')
+    sync.add_argument('--threads', default='1,2,4,8,16,32,64', type=_get_ints,
+                      help='comma separated amounts of threads (default: %(default)s)')
+    sync.add_argument('--processes', default='1,2,4,8', type=_get_ints,
+                      help='comma separated amounts of processes (default: %(default)s)')
+    sync.add_argument('--iterations', default=10, type=int,
+                      help='units of work done by each worker (default: %(default)s)')
+    sync.add_argument('--no-memory', action='store_true',
+                      help='do not measure memory')
+    sync.add_argument('--json', metavar='PATH',
+                      help='also write the results to PATH as JSON')
+
+    machines_ = subparsers.add_parser(
+        'machines', help='decomposition and language generation as functions of the size of the expression')
+    machines_.add_argument('--benchmarks', default=','.join(machines.BENCHMARKS),
+                           type=lambda s: _get_names(s, machines.BENCHMARKS),
+                           help='comma separated benchmarks (default: %(default)s)')
+    machines_.add_argument('--families', default=','.join(machines.FAMILIES),
+                           type=lambda s: _get_names(s, machines.FAMILIES),
+                           help='comma separated families of expressions (default: %(default)s)')
+    machines_.add_argument('--decomposers', default=','.join(machines.DECOMPOSERS),
+                           type=lambda s: _get_names(s, machines.DECOMPOSERS),
+                           help='comma separated decomposer classes (default: %(default)s)')
+    machines_.add_argument('--sizes', type=_get_ints,
+                           help='comma separated sizes of the expressions (default: the sizes of each family)')
+    machines_.add_argument('--repeat', default=3, type=int,
+                           help='runs of each generation benchmark, the best one is reported (default: %(default)s)')
+    machines_.add_argument('--json', metavar='PATH',
+                           help='also write the results to PATH as JSON')
+
+    imports_ = subparsers.add_parser(
+        'imports', help='time taken by usual imports of PathEx in a new interpreter')
+    imports_.add_argument('--repeat', default=5, type=int,
+                          help='runs of each import, the best one is reported (default: %(default)s)')
+    imports_.add_argument('--json', metavar='PATH',
+                          help='also write the results to PATH as JSON')
+
+    compare_ = subparsers.add_parser(
+        'compare', help='compare saved results with a baseline and flag regressions')
+    compare_.add_argument('current', metavar='CURRENT',
+                          help='JSON file written with --json')
+    compare_.add_argument('baseline', metavar='BASELINE', nargs='?',
+                          help=f'JSON file written with --json (default: the stored baseline of the suite of CURRENT in {BASELINES})')
+    compare_.add_argument('--threshold', default=0.25, type=float,
+                          help='relative change to worse that is a regression (default: %(default)s). Stored baselines are informative; to gate a change, compare with results of the same machine and --repeat')
+    compare_.add_argument('--normalize', action='store_true',
+                          help='scale the timings by the median of their ratios to the baseline, to compare results of another machine; this hides uniform slowdowns')
+    compare_.add_argument('--all', action='store_true',
+                          help='show all comparisons, not only the regressions')
+    return parser
+
+
+_SYNC_HEADER = f'{"scenario":<18} {"backend":<10} {"workers":>7} {"matches":>8} {"matches/s":>10} {"p50 ms":>8} {"p99 ms":>8} {"memory KiB":>10}'
+
+
+def _format_sync(result: dict[str, object]) -> str:
+    memory = '-' if result['memory_kib'] is None else f'{result["memory_kib"]:.1f}'
+    return f'{result["scenario"]:<18} {result["backend"]:<10} {result["workers"]:>7} {result["matches"]:>8} {result["matches_per_second"]:>10.1f} {result["p50"]*1e3:>8.3f} {result["p99"]*1e3:>8.3f} {memory:>10}'
+
+
+def _sync(args: argparse.Namespace) -> list[dict[str, object]]:
+    manager = None
+    if {'proxy', 'pipelined'} & set(args.backends):
+        from pathex.managing.processes import get_mp_process_manager
+        manager = get_mp_process_manager('__main__')
+    results = []
+    print(_SYNC_HEADER)
+    try:
+        for name in args.scenarios:
+            for backend in args.backends:
+                amounts = args.threads if backend == 'thread' else args.processes
+                for workers in amounts:
+                    try:
+                        result = synchronizer.run(
+                            synchronizer.SCENARIOS[name], backend, workers,
+                            args.iterations, manager, not args.no_memory)
+                    except ValueError as e:
+                        print(f'{name:<18} {backend:<10} skipped: {e}')
+                        break
+                    print(_format_sync(result), flush=True)
+                    results.append(result)
+    finally:
+        if manager is not None:
+            manager.shutdown()
+    return results
+
+
+_MACHINES_HEADER = f'{"benchmark":<18} {"family":<13} {"size":>4} {"decomposer":<30} {"seconds":>10} {"words/s":>10} {"memory KiB":>10}'
+
+
+def _format_machines(result: dict[str, object]) -> str:
+    words_per_second = result.get('words_per_second')
+    words_per_second = '-' if words_per_second is None else f'{words_per_second:.1f}'
+    memory = result.get('memory_kib')
+    memory = '-' if memory is None else f'{memory:.1f}'
+    return f'{result["benchmark"]:<18} {result["family"]:<13} {result["size"]:>4} {result["decomposer"]:<30} {result["seconds"]:>10.6f} {words_per_second:>10} {memory:>10}'
+
+
+def _machines(args: argparse.Namespace) -> list[dict[str, object]]:
+    results = []
+    print(_MACHINES_HEADER)
+    for benchmark in args.benchmarks:
+        for name in args.families:
+            family = machines.FAMILIES[name]
+            for size in args.sizes or family.sizes:
+                for decomposer_name in args.decomposers:
+                    decomposer = machines.DECOMPOSERS[decomposer_name]
+                    if not issubclass(decomposer, family.decomposer):
+                        continue
+                    result = machines.run(benchmark, family, size,
+                                          decomposer, args.repeat)
+                    print(_format_machines(result), flush=True)
+                    results.append(result)
+    return results
+
+
+def _imports(args: argparse.Namespace) -> list[dict[str, object]]:
+    results = []
+    print(f'{"statement":<45} {"ms":>8} {"modules":>8}')
+    for statement in imports.STATEMENTS:
+        result = imports.run(statement, args.repeat)
+        print(f'{statement:<45} {result["seconds"]*1e3:>8.1f} {result["modules"]:>8}', flush=True)
+        results.append(result)
+    return results
+
+
+def _compare(args: argparse.Namespace) -> bool:
+    suite, current = load(args.current)
+    if args.baseline is None:
+        baseline_path = BASELINES / f'{suite}.json'
+        if not baseline_path.exists():
+            # the results of some suites, as sync, depend too much on the amount of cores to be stored
+            print(f'there is no stored baseline of suite {suite!r}, nothing to compare')
+            return True
+    else:
+        baseline_path = args.baseline
+        if not Path(baseline_path).exists():
+            sys.exit(f'there is no baseline {baseline_path}')
+    baseline_suite, baseline = load(baseline_path)
+    if baseline_suite != suite:
+        sys.exit(f'{args.current} has results of suite {suite!r} but {baseline_path} has results of suite {baseline_suite!r}')
+    comparisons = compare(baseline, current, args.threshold, args.normalize)
+    regressions = [c for c in comparisons if c['regression']]
+    for c in comparisons if args.all else regressions:
+        parameters = ' '.join(f'{k}={v}' for k, v in c.items()
+                              if k not in ('metric', 'baseline', 'current', 'change', 'regression'))
+        flag = 'REGRESSION' if c['regression'] else 'ok'
+        print(f'{flag:<10} {parameters} {c["metric"]}: {c["baseline"]:.6g} -> {c["current"]:.6g} ({c["change"]:+.1%})')
+    print(f'{len(regressions)} regressions in {len(comparisons)} comparisons against {baseline_path}')
+    return not regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = _get_parser()
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0].startswith('-') and argv[0] not in ('-h', '--help'):
+        argv = ['sync', *argv]
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        if not _compare(args):
+            sys.exit(1)
+        return
+    suite = args.command
+    results = {'sync': _sync, 'machines': _machines,
+               'imports': _imports}[suite](args)
+    if args.json:
+        save(args.json, suite, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import statistics
+from pathlib import Path
+
+__doc__ = f"""
+
+Benchmarks comparison
+=====================
+
+:Module: ``{__name__}``
+
+---------------------------------------------------------------
+
+This module stores and compares the results of the benchmarks of |pe|. Results are saved as JSON objects with the name of the suite and the list of results, and the stored baselines of each suite are placed in the ``baselines`` directory of this package.
+
+Timings are compared as they are, so a change that makes every result slower is a regression. Timings of another machine, or of the same one under another load, differ by a factor that is shared by all the results, so they may be scaled by the median of their ratios before being compared, at the cost of hiding such uniform changes. Even so, the stored baselines are informative: to gate a change, the baseline should be measured in the same machine, with the same ``--repeat``, right before the change.
+"""
+
+__all__ = ['METRICS', 'BASELINES', 'save', 'load', 'compare']
+
+METRICS = {'matches_per_second': 1, 'p99': -1, 'seconds': -1, 'memory_kib': -1}
+"""The compared metrics. A positive value means that greater is better and a negative one that lower is better."""
+
+# Metrics that depend on the speed of the machine, with the power of the speed factor that scales them, and the least absolute change of each one that is taken as a regression, as shorter timings are dominated by noise.
+_TIMED = {'matches_per_second': -1, 'p99': 1, 'seconds': 1}
+_MIN_CHANGES = {'p99': 1e-3, 'seconds': 1e-3}
+
+# Values that depend on the measured ones, so they do not identify a result.
+_DERIVED = {'matches', 'words', 'words_per_second', 'p50', 'modules'}
+
+BASELINES = Path(__file__).parent / 'baselines'
+
+
+def save(path: str | Path, suite: str, results: list[dict[str, object]]) -> None:
+    """Saves the ``results`` of ``suite`` as JSON in ``path``."""
+    with open(path, 'w') as f:
+        json.dump({'suite': suite, 'results': results}, f, indent=2)
+        f.write('\n')
+
+
+def load(path: str | Path) -> tuple[str, list[dict[str, object]]]:
+    """Gives the suite and the results saved in ``path``."""
+    with open(path) as f:
+        data = json.load(f)
+    return data['suite'], data['results']
+
+
+def _get_key(result: dict[str, object]) -> tuple:
+    return tuple(sorted((k, v) for k, v in result.items()
+                        if k not in METRICS and k not in _DERIVED))
+
+
+def _get_speed_factor(pairs: list[tuple[dict[str, object], dict[str, object]]]) -> float:
+    ratios = [(new[metric] / old[metric])**sign
+              for old, new in pairs
+              for metric, sign in _TIMED.items()
+              if old.get(metric) and new.get(metric)]
+    return statistics.median(ratios) if ratios else 1.0
+
+
+def compare(baseline: list[dict[str, object]], current: list[dict[str, object]],
+            threshold: float = 0.25, normalize: bool = False) -> list[dict[str, object]]:
+    """Compares the metrics of the results of ``current`` with the ones of ``baseline`` that were measured with the same parameters.
+
+    Each comparison gives a :class:`dict` with the parameters of the result, the ``metric``, its ``baseline`` and ``current`` values, the relative ``change`` and whether it is a ``regression``, that is, a change to worse greater than ``threshold``. A change of ``seconds`` or ``p99`` is only a regression if it is also greater than a millisecond. Results without counterpart are ignored.
+
+    If ``normalize`` is true, the timings of ``current`` are divided by the median of their ratios to the ones of ``baseline`` (and the rates are multiplied by it) before computing the changes, so a machine that is uniformly slower does not give regressions, while a change that only affects some results still does. Then a change that makes every result slower is not a regression either, so it is only meant to compare with the results of another machine.
+
+    .. testsetup::
+
+       from pathex.bench.compare import compare
+
+    >>> baseline = [{'family': 'union', 'size': 4, 'seconds': 1.0, 'words': 4},
+    ...             {'family': 'union', 'size': 8, 'seconds': 1.0, 'words': 8}]
+    >>> current = [{'family': 'union', 'size': 4, 'seconds': 1.5, 'words': 4},
+    ...            {'family': 'union', 'size': 8, 'seconds': 0.5, 'words': 8},
+    ...            {'family': 'union', 'size': 16, 'seconds': 1.0, 'words': 16}]
+    >>> [(c['size'], c['change'], c['regression']) for c in compare(baseline, current)]
+    [(4, 0.5, True), (8, -0.5, False)]
+    >>> [(c['size'], c['change'], c['regression']) for c in compare(baseline, current, threshold=1.0)]
+    [(4, 0.5, False), (8, -0.5, False)]
+
+    When every result is two times slower, every result is a regression, unless the timings are normalized, which only flags the result that is slower than the others:
+
+    >>> current = [{'family': 'union', 'size': size, 'seconds': 2.0*seconds}
+    ...            for size, seconds in [(4, 1.0), (8, 1.0), (16, 1.0)]]
+    >>> baseline = [{'family': 'union', 'size': size, 'seconds': seconds}
+    ...             for size, seconds in [(4, 1.0), (8, 1.0), (16, 0.25)]]
+    >>> [(c['size'], c['change'], c['regression']) for c in compare(baseline, current)]
+    [(4, 1.0, True), (8, 1.0, True), (16, 7.0, True)]
+    >>> [(c['size'], c['change'], c['regression']) for c in compare(baseline, current, normalize=True)]
+    [(4, 0.0, False), (8, 0.0, False), (16, 3.0, True)]
+
+    >>> baseline = [{'family': 'union', 'size': 4, 'seconds': 0.0001}]
+    >>> current = [{'family': 'union', 'size': 4, 'seconds': 0.0003}]
+    >>> [c['regression'] for c in compare(baseline, current)]
+    [False]
+    """
+    baselines = {_get_key(r): r for r in baseline}
+    pairs = [(old, result) for result in current
+             if (old := baselines.get(_get_key(result))) is not None]
+    factor = _get_speed_factor(pairs) if normalize else 1.0
+    comparisons = []
+    for old, result in pairs:
+        for metric, sign in METRICS.items():
+            if old.get(metric) is None or result.get(metric) is None:
+                continue
+            value = result[metric] / factor**_TIMED.get(metric, 0)
+            change = (value - old[metric]) / old[metric] \
+                if old[metric] else 0.0
+            regression = -sign*change > threshold \
+                and abs(value - old[metric]) > _MIN_CHANGES.get(metric, 0)
+            comparisons.append({**dict(_get_key(result)),
+                                'metric': metric,
+                                'baseline': old[metric],
+                                'current': result[metric],
+                                'change': change,
+                                'regression': regression})
+    return comparisons
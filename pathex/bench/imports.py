@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+__doc__ = f"""
+
+Import time benchmarks
+======================
+
+:Module: ``{__name__}``
+
+---------------------------------------------------------------
+
+This module measures the time taken by the imports of |pe| that are usual in programs that only build expressions and in programs that synchronize threads or processes. Each statement is run in a new interpreter with ``python -X importtime``, so the measure does not depend on the modules already imported by the current one.
+"""
+
+__all__ = ['STATEMENTS', 'run']
+
+STATEMENTS = (
+    'import pathex',
+    'import pathex.expressions',
+    'from pathex import Concatenation, Union, Tag',
+    'from pathex.expressions.aliases import *',
+    'from pathex import Synchronizer',
+    'from pathex import get_mp_process_manager',
+    'from pathex import SharedSynchronizer',
+)
+
+
+def _get_imports(statement: str) -> list[tuple[str, int, bool]]:
+    # Gives the name, the cumulative microseconds and whether it is an outermost import, of each module imported while running ``statement``.
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            imports.append((name.strip(), int(cumulative),
+                            not name.startswith('  ')))
+    return imports
+
+
+def run(statement: str, repeat: int = 5) -> dict[str, object]:
+    """Runs ``statement`` in ``repeat`` new interpreters and gives the best time taken by the imports it does, and the amount of modules it imports, as a :class:`dict`. The imports done by the interpreter at startup are not taken into account.
+
+    >>> from pathex.bench.imports import run
+    >>> result = run('import pathex', 1)
+    >>> assert result['seconds'] > 0 and result['modules'] > 0
+    """
+    startup = {name for name, _, _ in _get_imports('pass')}
+    best = None
+    for _ in range(repeat):
+        imports = [(t, outermost) for name, t, outermost in _get_imports(statement)
+                   if name not in startup]
+        seconds = sum(t for t, outermost in imports if outermost) / 1e6
+        if best is None or seconds < best[0]:
+            best = seconds, len(imports)
+    return {'statement': statement, 'seconds': best[0], 'modules': best[1]}
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import inspect
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+from pathex.expressions.expression import Expression
+from pathex.expressions.nary_operators.concatenation import Concatenation
+from pathex.expressions.nary_operators.difference import Difference
+from pathex.expressions.nary_operators.intersection import Intersection
+from pathex.expressions.nary_operators.shuffle import Shuffle
+from pathex.expressions.nary_operators.union import Union
+from pathex.expressions.terms.alphabet import ALPHABET
+from pathex.generation.eager import words_generator
+from pathex.generation.words_generator import WordsGenerator
+from pathex.machines.decomposers.decomposer import Decomposer
+from pathex.machines.decomposers.extended_decomposer import \
+    ExtendedDecomposer
+from pathex.machines.decomposers.extended_decomposer_alphabet import \
+    ExtendedDecomposerAlphabet
+from pathex.machines.decomposers.extended_decomposer_compalphabet import \
+    ExtendedDecomposerCompalphabet
+from pathex.machines.decomposers.simple_decomposer import SimpleDecomposer
+
+__doc__ = f"""
+
+Machines benchmarks
+===================
+
+:Module: ``{__name__}``
+
+---------------------------------------------------------------
+
+This module measures the cost of the machine layer as a function of the size of the expression, for each of the decomposer classes. The expressions belong to families of growing size, like long concatenations, wide unions, nested shuffles, and intersections and differences, some of them with :data:`~.ALPHABET`.
+
+The available benchmarks are ``transform`` (the time of one call to :meth:`.Decomposer.transform`, consuming all its branches, and the visitor that serves it), ``words_generator`` (the words per second given by :func:`~.words_generator`), ``generator_language`` (the words per second given by :meth:`.WordsGenerator.get_language`) and ``get_language`` (the time and the peak of allocated memory of :meth:`.Expression.get_language`).
+"""
+
+__all__ = ['Family', 'FAMILIES', 'DECOMPOSERS', 'BENCHMARKS', 'run']
+
+DECOMPOSERS: dict[str, type[Decomposer]] = {d.__name__: d for d in (
+    SimpleDecomposer, ExtendedDecomposer,
+    ExtendedDecomposerAlphabet, ExtendedDecomposerCompalphabet)}
+
+BENCHMARKS = ('transform', 'words_generator',
+              'generator_language', 'get_language')
+
+
+def _letters(n: int) -> list[str]:
+    return [f'x{i}' for i in range(n)]
+
+
+def _nested_shuffle(n: int) -> Expression:
+    # the language has (2n)!/2**n words
+    exp = Concatenation('a0', 'b0')
+    for i in range(1, n):
+        exp = Shuffle(Concatenation(f'a{i}', f'b{i}'), exp)
+    return exp
+
+
+@dataclass(frozen=True)
+class Family:
+    """A family of expressions of growing size."""
+    name: str
+    get_expression: Callable[[int], Expression]
+    """Gives the expression of the given size."""
+    sizes: tuple[int, ...]
+    """The default sizes to be measured."""
+    decomposer: type[Decomposer] = SimpleDecomposer
+    """The least decomposer class that interprets the family. Only it and its subclasses are measured."""
+
+
+FAMILIES = {f.name: f for f in (
+    Family('concatenation',
+           lambda n: Concatenation(*_letters(n)), (4, 16, 64)),
+    Family('union',
+           lambda n: Union(*_letters(n)), (4, 16, 64)),
+    Family('shuffle', _nested_shuffle, (2, 3, 4), ExtendedDecomposer),
+    Family('intersection',
+           lambda n: Intersection(Concatenation(*_letters(n)),
+                                  Concatenation(*[ALPHABET]*n)),
+           (4, 16, 64), ExtendedDecomposerAlphabet),
+    Family('difference',
+           lambda n: Difference(Union(*_letters(n)),
+                                Union(*_letters(n)[::2])),
+           (4, 16, 64), ExtendedDecomposer),
+)}
+
+
+def _get_visitor(decomposer: Decomposer, expression: object) -> str:
+    transformer = inspect.getattr_static(type(decomposer), '_transform')
+    return transformer.dispatcher.dispatch(type(expression)).__name__
+
+
+def _best(f: Callable[[], object], repeat: int) -> float:
+    return min(timeit.repeat(f, number=1, repeat=repeat))
+
+
+def _count(iterable) -> int:
+    n = 0
+    for _ in iterable:
+        n += 1
+    return n
+
+
+def run(benchmark: str, family: Family, size: int,
+        decomposer: type[Decomposer], repeat: int = 3) -> dict[str, object]:
+    """Runs ``benchmark`` for the expression of ``family`` of the given ``size``, interpreted by an instance of ``decomposer``, and gives the results as a :class:`dict`.
+
+    ``seconds`` is the best time among ``repeat`` runs, except for ``transform``, where it is the mean time of a call among as many calls as needed to take at least 0.2 seconds.
+
+    >>> from pathex.bench.machines import FAMILIES, run
+    >>> from pathex.machines.decomposers.extended_decomposer import ExtendedDecomposer
+    >>> result = run('transform', FAMILIES['shuffle'], 2, ExtendedDecomposer)
+    >>> result['visitor']
+    'shuffle_visitor'
+    >>> result = run('get_language', FAMILIES['shuffle'], 2, ExtendedDecomposer, 1)
+    >>> result['words']
+    6
+    >>> assert result['seconds'] > 0 and result['memory_kib'] > 0
+    """
+    if not issubclass(decomposer, family.decomposer):
+        raise ValueError(
+            f'{decomposer.__name__} can not interpret family {family.name!r}')
+    expression = family.get_expression(size)
+    machine = decomposer()
+    result = {'benchmark': benchmark,
+              'family': family.name,
+              'size': size,
+              'decomposer': decomposer.__name__}
+
+    if benchmark == 'transform':
+        timer = timeit.Timer(lambda: list(machine.transform(expression)))
+        number, seconds = timer.autorange()
+        result['visitor'] = _get_visitor(machine, expression)
+        result['seconds'] = seconds / number
+        return result
+
+    if benchmark == 'words_generator':
+        def f(): return _count(words_generator(expression, machine))
+    elif benchmark == 'generator_language':
+        def f(): return len(WordsGenerator(expression, machine).get_language())
+    elif benchmark == 'get_language':
+        def f(): return len(expression.get_language(decomposer=machine))
+    else:
+        raise ValueError(f'unknown benchmark {benchmark!r}')
+
+    words = f()  # warm up and count
+    result['words'] = words
+    result['seconds'] = seconds = _best(f, repeat)
+    if benchmark == 'get_language':
+        tracemalloc.start()
+        f()
+        result['memory_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    else:
+        result['words_per_second'] = words / seconds
+    return result
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import threading
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter, sleep
+from typing import Callable
+
+from pathex.adts.histogram import Histogram
+from pathex.expressions.expression import Expression
+from pathex.expressions.nary_operators.concatenation import Concatenation
+from pathex.managing.shared_synchronizer import SharedSynchronizer
+from pathex.managing.synchronizer import Synchronizer
+from pathex.managing.tag import Tag
+
+__doc__ = f"""
+
+Synchronizer benchmarks
+=======================
+
+:Module: ``{__name__}``
+
+---------------------------------------------------------------
+
+This module measures the throughput of the synchronizers in the scenarios of the examples of :class:`~.Synchronizer`. Each scenario is run by a given amount of workers, being them threads or processes, that match labels as fast as possible. The results contain the amount of matched labels per second, the percentiles of the time each label takes to be matched, and the peak of memory allocated while the scenario runs.
+
+The available backends are ``thread`` (a :class:`~.Synchronizer` shared by threads), ``proxy`` and ``pipelined`` (a :class:`~.Synchronizer` shared by processes through a :class:`~.SynchronizerProxy` or a :class:`~.PipelinedSynchronizerProxy`) and ``shared`` (a :class:`~.SharedSynchronizer` shared by processes).
+"""
+
+__all__ = ['Scenario', 'SCENARIOS', 'BACKENDS', 'run']
+
+BACKENDS = ('thread', 'proxy', 'pipelined', 'shared')
+
+# Tags must be named and visible for import, so processes can use them
+a, b, c = Tag.named('a', 'b', 'c')
+writer, reader = Tag.named('writer', 'reader')
+
+Work = Callable[[object, int, Histogram], None]
+
+
+def _match(sync, label: object, histogram: Histogram) -> None:
+    start = perf_counter()
+    sync.match(label)
+    histogram.add(perf_counter() - start)
+
+
+def _region(sync, tag: Tag, histogram: Histogram) -> None:
+    start = perf_counter()
+    with sync.region(tag):
+        entered = perf_counter()
+        histogram.add(entered - start)
+    histogram.add(perf_counter() - entered)
+
+
+def _producer(sync, n: int, histogram: Histogram) -> None:
+    for _ in range(n):
+        _match(sync, 'Pi', histogram)
+        _match(sync, 'Pf', histogram)
+
+
+def _consumer(sync, n: int, histogram: Histogram) -> None:
+    for _ in range(n):
+        _match(sync, 'Ci', histogram)
+        _match(sync, 'Cf', histogram)
+
+
+def _producer_consumer(sync, n: int, histogram: Histogram) -> None:
+    for _ in range(n):
+        _producer(sync, 1, histogram)
+        _consumer(sync, 1, histogram)
+
+
+def _a_regions(sync, n: int, histogram: Histogram) -> None:
+    for _ in range(n):
+        _region(sync, a, histogram)
+
+
+def _bc_regions(sync, n: int, histogram: Histogram) -> None:
+    for i in range(n):
+        _region(sync, b if i % 2 else c, histogram)
+
+
+def _abc_regions(sync, n: int, histogram: Histogram) -> None:
+    for i in range(n):
+        _a_regions(sync, 1, histogram)
+        _region(sync, b if i % 2 else c, histogram)
+
+
+def _writer_regions(sync, n: int, histogram: Histogram) -> None:
+    for _ in range(n):
+        _region(sync, writer, histogram)
+
+
+def _reader_regions(sync, n: int, histogram: Histogram) -> None:
+    for _ in range(n):
+        _region(sync, reader, histogram)
+
+
+def _reader_writer_regions(sync, n: int, histogram: Histogram) -> None:
+    for _ in range(n):
+        _region(sync, reader, histogram)
+        _region(sync, writer, histogram)
+
+
+def _balanced(first: Work, second: Work, both: Work) -> Callable[[int, int], list[tuple[Work, int]]]:
+    # Each unit of work of ``first`` must be completed by one of ``second``, so the units of ``second`` are distributed among its workers.
+    def get_works(workers: int, n: int) -> list[tuple[Work, int]]:
+        if workers == 1:
+            return [(both, n)]
+        firsts = workers - workers//2
+        seconds = workers//2
+        quotient, remainder = divmod(firsts*n, seconds)
+        return [(first, n)]*firsts + \
+            [(second, quotient + (i < remainder)) for i in range(seconds)]
+    return get_works
+
+
+def _readers_writers(workers: int, n: int) -> list[tuple[Work, int]]:
+    if workers == 1:
+        return [(_reader_writer_regions, n)]
+    writers = max(1, workers//4)
+    return [(_writer_regions, n)]*writers + \
+        [(_reader_regions, n)]*(workers - writers)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A benchmark scenario."""
+    name: str
+    get_expression: Callable[[], Expression]
+    """Gives the expression of the synchronizer."""
+    get_works: Callable[[int, int], list[tuple[Work, int]]]
+    """Gives the work of each worker, given the amount of workers and the amount of iterations of each one."""
+    finite: bool = True
+    """Whether the expression has a finite amount of states, so it can be run by a :class:`~.SharedSynchronizer`."""
+
+
+SCENARIOS = {s.name: s for s in (
+    Scenario('producer_consumer',
+             lambda: +Concatenation('Pi', 'Pf', 'Ci', 'Cf'),
+             _balanced(_producer, _consumer, _producer_consumer)),
+    Scenario('regions',
+             lambda: (a + (b | c))+...,
+             _balanced(_a_regions, _bc_regions, _abc_regions)),
+    Scenario('readers_writers',
+             lambda: (writer | reader//...)+...,
+             _readers_writers, finite=False),
+)}
+
+
+def _run_threads(sync, works: list[tuple[Work, int]],
+                 trace_memory: bool = False) -> tuple[float, Histogram, float | None]:
+    histograms = [Histogram() for _ in works]
+    barrier = threading.Barrier(len(works) + 1)
+
+    def target(work: Work, n: int, histogram: Histogram):
+        barrier.wait()
+        work(sync, n, histogram)
+
+    threads = [threading.Thread(target=target, args=(*work, histogram))
+               for work, histogram in zip(works, histograms)]
+    for thread in threads:
+        thread.start()
+    if trace_memory:
+        tracemalloc.start()
+    barrier.wait()
+    start = perf_counter()
+    for thread in threads:
+        thread.join()
+    seconds = perf_counter() - start
+    memory = None
+    if trace_memory:
+        memory = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    total = Histogram()
+    for histogram in histograms:
+        total.merge(histogram)
+    return seconds, total, memory
+
+
+_sync = None
+
+
+def _init_process(sync) -> None:
+    global _sync
+    _sync = sync
+
+
+def _warm_up(seconds: float) -> None:
+    sleep(seconds)
+
+
+def _process_work(work: Work, n: int, trace_memory: bool) -> tuple[Histogram, float | None]:
+    histogram = Histogram()
+    if trace_memory:
+        tracemalloc.start()
+    work(_sync, n, histogram)
+    if flush := getattr(_sync, 'flush', None):
+        flush()
+    memory = None
+    if trace_memory:
+        memory = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return histogram, memory
+
+
+def _run_processes(sync, works: list[tuple[Work, int]],
+                   trace_memory: bool = False) -> tuple[float, Histogram, float | None]:
+    total = Histogram()
+    memory = 0.0 if trace_memory else None
+    with ProcessPoolExecutor(len(works), initializer=_init_process,
+                             initargs=(sync,)) as executor:
+        # all the processes are started before measuring
+        list(executor.map(_warm_up, [0.05]*len(works)))
+        start = perf_counter()
+        futures = [executor.submit(_process_work, *work, trace_memory)
+                   for work in works]
+        for future in futures:
+            histogram, peak = future.result()
+            total.merge(histogram)
+            if trace_memory:
+                memory += peak
+        seconds = perf_counter() - start
+    return seconds, total, memory
+
+
+def _get_synchronizer(backend: str, expression: Expression, manager):
+    if backend == 'thread':
+        return Synchronizer(expression)
+    elif backend == 'proxy':
+        return manager.Synchronizer(expression)
+    elif backend == 'pipelined':
+        return manager.PipelinedSynchronizer(expression)
+    elif backend == 'shared':
+        return SharedSynchronizer(expression)
+    else:
+        raise ValueError(f'unknown backend {backend!r}')
+
+
+def run(scenario: Scenario, backend: str, workers: int, iterations: int,
+        manager=None, measure_memory: bool = True) -> dict[str, object]:
+    """Runs ``scenario`` with the given amount of ``workers``, each one doing ``iterations`` units of work, and gives the results as a :class:`dict`.
+
+    ``manager`` must be a manager given by :func:`~.get_mp_process_manager` if ``backend`` is ``proxy`` or ``pipelined``.
+
+    If ``measure_memory`` is ``True``, the scenario is run again while :mod:`tracemalloc` is tracing, in order to give the peak of allocated memory without affecting the throughput. With the process backends, each worker process traces its own allocations and the sum of their peaks is given. The memory of the server process of the ``proxy`` and ``pipelined`` backends is not included.
+
+    A :class:`ValueError` is raised if ``backend`` is ``shared`` and the expression of ``scenario`` has an unbounded amount of states.
+
+    >>> from pathex.bench.synchronizer import SCENARIOS, run
+    >>> result = run(SCENARIOS['producer_consumer'], 'thread', 2, 5)
+    >>> result['matches']
+    20
+    >>> assert result['matches_per_second'] > 0 and result['memory_kib'] > 0
+    """
+    if backend == 'shared' and not scenario.finite:
+        raise ValueError(
+            f'scenario {scenario.name!r} can not be run by backend {backend!r}')
+    works = scenario.get_works(workers, iterations)
+    run_works = _run_threads if backend == 'thread' else _run_processes
+    sync = _get_synchronizer(backend, scenario.get_expression(), manager)
+    seconds, histogram, _ = run_works(sync, works)
+    if isinstance(sync, SharedSynchronizer):
+        sync.close()
+
+    memory = None
+    if measure_memory:
+        sync = _get_synchronizer(backend, scenario.get_expression(), manager)
+        _, _, memory = run_works(sync, works, True)
+        if isinstance(sync, SharedSynchronizer):
+            sync.close()
+
+    return {'scenario': scenario.name,
+            'backend': backend,
+            'workers': workers,
+            'iterations': iterations,
+            'matches': histogram.count,
+            'seconds': seconds,
+            'matches_per_second': histogram.count / seconds,
+            'p50': histogram.percentile(0.5),
+            'p99': histogram.percentile(0.99),
+            'memory_kib': memory}
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from abc import ABC
 from math import inf
-from typing import Collection, Generator, TypeVar
+from random import Random
+from typing import Collection, Generator, Hashable, Iterable, Iterator, TypeVar
 
 from pathex.adts.collection_wrapper import CollectionWrapper
-from pathex.generation.defaults import COMPLETE_WORDS, LANGUAGE_TYPE, WORD_TYPE
-from pathex.machines.decomposers.decomposer import Decomposer
+from pathex.generation.defaults import (COMPLETE_WORDS, LANGUAGE_TYPE, MAX_PAIRS,
+                                        WORD_TYPE)
+from pathex.machines.decomposers.decomposer import Decomposer, DecomposerMatch
 
 __doc__ = f"""
 
@@ -36,11 +38,11 @@ def _get_non_optional_repetition_or_binary_op(binary_op):
     def f(self, v):
         import pathex
         if v in (inf, Ellipsis):
-            return pathex.__dict__[f'{binary_op}Repetition'](self, 1, inf)
+            return getattr(pathex, f'{binary_op}Repetition')(self, 1, inf)
         elif isinstance(v, int):
-            return pathex.__dict__[f'{binary_op}Repetition'](self, v, v)
+            return getattr(pathex, f'{binary_op}Repetition')(self, v, v)
         else:
-            return pathex.__dict__[binary_op](self, v)
+            return getattr(pathex, binary_op)(self, v)
     return f
 
 
@@ -48,12 +50,12 @@ def _get_optional_repetition_or_binary_op(binary_op):
     def f(self, v):
         import pathex
         if isinstance(v, list):
-            return pathex.__dict__[f'{binary_op}Repetition'](self, *v)
+            return getattr(pathex, f'{binary_op}Repetition')(self, *v)
         elif v in (inf, Ellipsis) or isinstance(v, int):
-            return pathex.__dict__[f'{binary_op}Repetition'](self, 0, v)
+            return getattr(pathex, f'{binary_op}Repetition')(self, 0, v)
         else:
             from pathex import optional
-            return pathex.__dict__[binary_op](optional(self), v)
+            return getattr(pathex, binary_op)(optional(self), v)
     return f
 
 
@@ -103,18 +105,24 @@ class Expression(ABC):
 
     def get_language(self, language_type: type[T] = LANGUAGE_TYPE,
                      decomposer: Decomposer | None = None,
-                     complete_words: bool = COMPLETE_WORDS) -> T:
+                     complete_words: bool = COMPLETE_WORDS,
+                     workers: int = 1) -> T:
         if decomposer is None:
             from pathex.machines.decomposers.extended_decomposer_compalphabet import \
                 ExtendedDecomposerCompalphabet
             decomposer = ExtendedDecomposerCompalphabet()
-        from pathex.generation.eager import words_generator
+        if workers > 1:
+            from pathex.generation.parallel import parallel_words_generator
+            words = parallel_words_generator(self, decomposer, complete_words, max_workers=workers)
+        else:
+            from pathex.generation.eager import words_generator
+            words = words_generator(self, decomposer, complete_words)
         language = language_type()
-        for w in words_generator(self, decomposer, complete_words):
+        for w in words:
             language.put(w)
         return language
     get_language.__doc__ = f"""
-        get_language(language_type: type[T] = {LANGUAGE_TYPE.__name__}, machine: pathex.generation.machines.machine.Machine | None = None, word_type: type[pathex.adts.collection_wrapper.CollectionWrapper] = {WORD_TYPE.__name__}, complete_words: bool = {COMPLETE_WORDS}) -> T
+        get_language(language_type: type[T] = {LANGUAGE_TYPE.__name__}, machine: pathex.generation.machines.machine.Machine | None = None, word_type: type[pathex.adts.collection_wrapper.CollectionWrapper] = {WORD_TYPE.__name__}, complete_words: bool = {COMPLETE_WORDS}, workers: int = 1) -> T
 
         Gives a :class:`~.CollectionWrapper` object that contains :class:`~.CollectionWrapper` objects that represent the words generated by the expression.
 
@@ -125,7 +133,188 @@ class Expression(ABC):
         ``word_type`` is a :class:`~.CollectionWrapper` subtype that will be the type of collection to be used to represent words. Defaults to :class:`{WORD_TYPE.__name__} <.CollectionWrapper>`.
 
         ``complete_words`` is a flag indicating if only complete words are to be given. Defaults to :obj:`{COMPLETE_WORDS}`.
+
+        ``workers`` is the amount of processes that generate the words. If it is greater than ``1`` the words are generated by :func:`~.parallel_words_generator`. Defaults to ``1``.
+
+        >>> from pathex.expressions.aliases import *
+        >>> exp = S(C('a', 'b'), C('c', 'd'), 'e')
+        >>> assert exp.get_language(workers=2) == exp.get_language()
+        """
+
+    def get_batches(self, batch_size: int = 1000, word_format: str = 'tuple',
+                    decomposer: Decomposer | None = None,
+                    complete_words: bool = COMPLETE_WORDS,
+                    queue_size: int = 2) -> Iterator:
+        """Gives the words generated by the expression in batches of ``batch_size`` words, as lists of tuples or strings, or as :class:`~.LabelIdsBatch` objects, produced in another thread at most ``queue_size`` batches ahead. See :func:`~.words_batches`.
+
+        >>> from pathex.expressions.aliases import *
+        >>> [len(batch) for batch in S('a', 'b', 'c').get_batches(4, 'str')]
+        [4, 2]
+        """
+        from pathex.generation.batches import words_batches
+        return words_batches(self, batch_size, word_format, decomposer, complete_words,
+                             queue_size=queue_size)
+
+    def accepts(self, word: Iterable[Hashable],
+                decomposer: DecomposerMatch | None = None) -> bool:
+        """Gives whether ``word`` is generated by the expression.
+
+        The expression is derived by each letter of the word, one after the other, so the language is never enumerated and the cost is proportional to the length of the word. To test many words of the same expression, use :meth:`accepts_many` or a :class:`~.Specification`, that keeps the derivations already done.
+
+        >>> from pathex.expressions.aliases import *
+        >>> exp = C('a', 'b') % 10
+        >>> exp.accepts('aabb'), exp.accepts('abba'), exp.accepts('ab'*11)
+        (True, False, False)
+        >>> C(_, 'b').accepts('xb')
+        True
+
+        ``decomposer`` is the machine used to derive the expression. If it is :obj:`None` then an instance of :class:`~.ExtendedDecomposerCompalphabet` will be used.
+        """
+        from pathex.managing.specification import Specification
+        return Specification(self, decomposer).accepts(word)
+
+    def matches_prefix(self, word: Iterable[Hashable],
+                       decomposer: DecomposerMatch | None = None) -> bool:
+        """Gives whether ``word`` can be matched from the beginning of the expression, in the same way as a manager matches labels, so it is a prefix of the generated words unless it leads to a dead end of an intersection or a difference.
+
+        >>> from pathex.expressions.aliases import *
+        >>> exp = C('a', 'b') % 10
+        >>> exp.matches_prefix('aab'), exp.matches_prefix('abb')
+        (True, False)
+
+        ``decomposer`` is used as in :meth:`accepts`.
+        """
+        from pathex.managing.specification import Specification
+        return Specification(self, decomposer).allows(word)
+
+    def accepts_many(self, words: Iterable[Iterable[Hashable]],
+                     decomposer: DecomposerMatch | None = None) -> list[bool]:
+        """Gives whether each one of ``words`` is generated by the expression, as :meth:`accepts` does, but matching each common prefix of the words only once. See :meth:`.Specification.accepts_many`.
+
+        >>> from pathex.expressions.aliases import *
+        >>> (C('a', 'b') % 10).accepts_many(['ab', 'abab', 'abb', 'aabb'])
+        [True, True, False, True]
+        """
+        from pathex.managing.specification import Specification
+        return Specification(self, decomposer).accepts_many(words)
+
+    def count_words(self, max_length: int,
+                    decomposer: Decomposer | None = None) -> list[int]:
+        """Gives the amount of different words of each length, from ``0`` to ``max_length``, generated by the expression, without generating them. See :func:`~.count_words`.
+
+        >>> from pathex import Tag
+        >>> a, b = Tag.named('a', 'b')
+        >>> (a // b).count_words(4)
+        [0, 0, 0, 0, 6]
+        """
+        from pathex.generation.counting import count_words
+        return count_words(self, max_length, decomposer)
+
+    def sample(self, length: int | None, n: int = 1, rng: Random | None = None,
+               max_length: int = 100, decomposer: Decomposer | None = None) -> list[tuple]:
+        """Gives ``n`` random words generated by the expression: drawn uniformly among the words of the given ``length``, or, if it is :obj:`None`, by random walks of at most ``max_length`` letters. See :func:`~.sample_words`.
+
+        >>> import random
+        >>> from pathex import Tag
+        >>> a, b = Tag.named('a', 'b')
+        >>> trace, = ((a | b//...)+...).sample(12, rng=random.Random(0))
+        >>> len(trace)
+        12
+        """
+        from pathex.generation.counting import sample_words
+        return sample_words(self, length, n, rng, max_length, decomposer)
+
+    def shortest_word(self, max_length: int | None = None,
+                      decomposer: Decomposer | None = None) -> tuple | None:
+        """Gives one of the shortest words generated by the expression, or :obj:`None` if there is none of at most ``max_length`` letters. See :func:`~.shortest_word`.
+
+        >>> from pathex.expressions.aliases import *
+        >>> (C('a', 'b')//... & S('b', 'a', 'a', 'b')).shortest_word()
+        ('a', 'b', 'a', 'b')
+        """
+        from pathex.generation.counting import shortest_word
+        return shortest_word(self, max_length, decomposer)
+
+    def shortest_word_with_prefix(self, prefix: Iterable[Hashable], max_length: int | None = None,
+                                  decomposer: DecomposerMatch | None = None) -> tuple | None:
+        """Gives one of the shortest words generated by the expression that start with ``prefix``, or :obj:`None` if there is none with at most ``max_length`` letters after the prefix. The prefix is matched as :meth:`matches_prefix` does. See :meth:`.Specification.shortest_completion`.
+
+        >>> from pathex.expressions.aliases import *
+        >>> exp = U(C('a', 'b'), C('c', 'd', 'e'), C('c', LC('d')))
+        >>> exp.shortest_word_with_prefix('cd')
+        ('c', 'd', 'e')
+        >>> exp.shortest_word_with_prefix('cx')
+        ('c', 'x')
+        >>> exp.shortest_word_with_prefix('x') is None
+        True
+        """
+        from pathex.managing.specification import Specification
+        spec = Specification(self, decomposer)
+        state = spec.initial_state
+        prefix = tuple(prefix)
+        for label in prefix:
+            if (state := spec.derive(state, label)) is None:
+                return None
+        completion = spec.shortest_completion(state, max_length)
+        return None if completion is None else prefix + completion
+
+    def is_empty(self, decomposer: Decomposer | None = None,
+                 max_states: int = MAX_PAIRS) -> bool:
+        """Gives whether the expression does not generate any word, searching for the shortest one as :func:`~.shortest_word` does.
+
+        The search of an empty language with an unbounded amount of states, like the ones with shuffle closures as ``a//...``, does not end, so a :class:`ValueError` is raised if more than ``max_states`` states are found. As such states grow with each label, reaching the default bound may take minutes.
+
+        >>> from pathex.expressions.aliases import *
+        >>> (C('a', 'b')+... & C('b', 'a')+...).is_empty(), (C('a', 'b')+... & S('b', 'a')+...).is_empty()
+        (True, False)
+        >>> (C('a', 'b')//... & C(_*[0, ...], 'c')).is_empty(max_states=10)
+        Traceback (most recent call last):
+            ...
+        ValueError: more than 10 states found while searching the shortest word
+        """
+        from pathex.generation.counting import shortest_word
+        return shortest_word(self, None, decomposer, max_states) is None
+
+    def get_counterexample(self, other: object, subset: bool = False,
+                           decomposer: DecomposerMatch | None = None,
+                           max_pairs: int = MAX_PAIRS) -> tuple | None:
+        """Gives a word generated by the expression and not by ``other`` or, if ``subset`` is false, also a word generated by ``other`` and not by the expression, or :obj:`None` if there is no such word. See :func:`~.comparison.get_counterexample`.
+
+        Expressions with an unbounded amount of states, like the ones with shuffle closures as ``a//...``, can not be compared: a :class:`ValueError` is raised if more than ``max_pairs`` pairs of states are explored, which may take minutes with the default bound.
+
+        >>> from pathex import Tag
+        >>> r, w = Tag.named('r', 'w')
+        >>> old = w | r+...
+        >>> new = w | r*[1, 2]
+        >>> new.get_counterexample(old, subset=True) is None
+        True
+        >>> old.get_counterexample(new, subset=True)
+        ('r.enter', 'r.exit', 'r.enter', 'r.exit', 'r.enter', 'r.exit')
+        """
+        from pathex.managing.comparison import get_counterexample
+        return get_counterexample(self, other, subset, decomposer, max_pairs)
+
+    def is_subset(self, other: object, decomposer: DecomposerMatch | None = None,
+                  max_pairs: int = MAX_PAIRS) -> bool:
+        """Gives whether every word generated by the expression is generated by ``other``. See :meth:`get_counterexample`, also for the :class:`ValueError` raised with expressions with an unbounded amount of states.
+
+        >>> from pathex.expressions.aliases import *
+        >>> C('a', 'b').is_subset(S('a', 'b')), S('a', 'b').is_subset(C('a', 'b'))
+        (True, False)
+        """
+        return self.get_counterexample(other, True, decomposer, max_pairs) is None
+
+    def is_equivalent(self, other: object, decomposer: DecomposerMatch | None = None,
+                      max_pairs: int = MAX_PAIRS) -> bool:
+        """Gives whether the expression and ``other`` generate the same words, without enumerating them, so infinite languages may be compared as long as their amount of states is finite. See :meth:`get_counterexample`, also for the :class:`ValueError` raised with expressions with an unbounded amount of states.
+
+        >>> from pathex.expressions.aliases import *
+        >>> (C('a', 'b')+...).is_equivalent(C('a', 'b')*[1, ...])
+        True
+        >>> S('a', 'b').is_equivalent(C('a', 'b') | C('b', 'a')), S('a', 'b').is_equivalent(C('a', 'b'))
+        (True, False)
         """
+        return self.get_counterexample(other, False, decomposer, max_pairs) is None
 
     # self | other
     def __or__(self, other):
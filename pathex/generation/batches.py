@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from dataclasses import dataclass
+from queue import Empty, Queue
+from typing import Callable, Collection, Iterable, Iterator, Union
+
+from pathex.adts.containers.onion_collection import OnionCollection
+from pathex.generation.defaults import COMPLETE_WORDS, WORD_MAX_LENGTH
+from pathex.generation.eager import words_generator
+from pathex.machines.decomposers.decomposer import Decomposer
+from pathex.managing.labels import LABELS
+
+__doc__ = f"""
+
+Words batches
+=============
+
+:Module: ``{__name__}``
+
+---------------------------------------------------------------
+
+This module gives the words generated by an expression in batches, so their consumers pay the overhead of each batch instead of the one of each word.
+"""
+
+__all__ = ['LabelIdsBatch', 'WORD_FORMATS', 'words_batches']
+
+
+@dataclass(frozen=True)
+class LabelIdsBatch:
+    """A batch of words whose labels are given by their ids in :data:`~.LABELS`, in two flat arrays of 64 bits integers.
+
+    The ids of the labels of the word ``i`` are ``ids[offsets[i]:offsets[i + 1]]``. The arrays support the buffer protocol, so they may be wrapped without copies, for instance by ``numpy.frombuffer(batch.ids, dtype=numpy.int64)``.
+
+    .. testsetup::
+
+       from pathex.generation.batches import LabelIdsBatch
+
+    >>> from array import array
+    >>> batch = LabelIdsBatch(array('q', [3, 4, 3]), array('q', [0, 2, 2, 3]))
+    >>> len(batch), batch[0], batch[1], batch[2]
+    (3, (3, 4), (), (3,))
+    """
+    ids: array
+    offsets: array
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> tuple[int, ...]:
+        return tuple(self.ids[self.offsets[i]:self.offsets[i + 1]])
+
+
+Batch = Union[list, LabelIdsBatch]
+
+
+def _to_tuples(words: list[OnionCollection]) -> list[tuple]:
+    return [tuple(word.as_list()) for word in words]
+
+
+def _to_strs(words: list[OnionCollection]) -> list[str]:
+    # as SET_OF_STRS does
+    return [''.join(map(str, word.as_list())) for word in words]
+
+
+def _to_label_ids(words: list[OnionCollection]) -> LabelIdsBatch:
+    get_id = LABELS.get_id
+    ids = array('q')
+    offsets = array('q', [0])
+    for word in words:
+        ids.extend(map(get_id, word.as_list()))
+        offsets.append(len(ids))
+    return LabelIdsBatch(ids, offsets)
+
+
+WORD_FORMATS: dict[str, Callable[[list[OnionCollection]], Batch]] = {
+    'tuple': _to_tuples, 'str': _to_strs, 'ids': _to_label_ids}
+"""The formats of the words of the batches: a list of tuples of labels, a list of strings, as in :data:`~.SET_OF_STRS`, or a :class:`LabelIdsBatch`."""
+
+
+def _get_batches(words: Iterable[OnionCollection], batch_size: int,
+                 convert: Callable[[list[OnionCollection]], Batch]) -> Iterator[Batch]:
+    batch = []
+    for word in words:
+        batch.append(word)
+        if len(batch) == batch_size:
+            yield convert(batch)
+            batch = []
+    if batch:
+        yield convert(batch)
+
+
+# the end of the batches produced
+_END = object()
+
+
+@dataclass(frozen=True)
+class _Failure:
+    # the exception raised by the producer
+    exception: BaseException
+
+
+def _produce(batches: Iterator[Batch], queue: Queue, stop: threading.Event) -> None:
+    try:
+        for batch in batches:
+            queue.put(batch)
+            if stop.is_set():
+                return
+    except BaseException as e:
+        queue.put(_Failure(e))
+    else:
+        queue.put(_END)
+
+
+def _consume(batches: Iterator[Batch], queue_size: int) -> Iterator[Batch]:
+    queue: Queue = Queue(queue_size)
+    stop = threading.Event()
+    producer = threading.Thread(target=_produce, args=(batches, queue, stop), daemon=True)
+    producer.start()
+    try:
+        while (batch := queue.get()) is not _END:
+            if isinstance(batch, _Failure):
+                raise batch.exception
+            yield batch
+    finally:
+        # If the consumer stops early, the producer may be blocked on a full queue, so the queue is drained until the producer notices it has to stop.
+        stop.set()
+        while producer.is_alive():
+            try:
+                queue.get(timeout=0.01)
+            except Empty:
+                pass
+
+
+def words_batches(expression: object, batch_size: int = 1000, word_format: str = 'tuple',
+                  decomposer: Decomposer | None = None,
+                  complete_words: bool = COMPLETE_WORDS,
+                  word_max_length: int = WORD_MAX_LENGTH,
+                  queue_size: int = 2,
+                  generator: Callable[..., Iterable[Collection]] = words_generator) -> Iterator[Batch]:
+    """Gives the words generated by ``expression`` in batches of ``batch_size`` words, except maybe the last one.
+
+    The words are generated, and converted to ``word_format``, in a producer thread, which waits while there are ``queue_size`` batches not taken yet. So the generation goes ahead of the consumer, as long as the consumer keeps up, while the memory taken by the batches is bounded. If ``queue_size`` is ``0``, the batches are produced when they are taken, without any thread. If the consumer stops taking batches before the end, the producer stops after at most one batch more. An exception raised by the generation is raised to the consumer.
+
+    .. testsetup::
+
+       from pathex.generation.batches import words_batches
+
+    >>> from pathex.expressions.aliases import *
+    >>> exp = S(C('a', 'b'), C('c', 'd'), 'e')
+    >>> batches = list(words_batches(exp, 12, 'str'))
+    >>> [len(batch) for batch in batches]
+    [12, 12, 6]
+    >>> assert {word for batch in batches for word in batch} == exp.get_language()
+    >>> batch, = words_batches(U('a', C('a', 'b')), word_format='tuple', queue_size=0)
+    >>> sorted(batch)
+    [('a',), ('a', 'b')]
+    >>> from pathex.managing.labels import LABELS
+    >>> batch, = words_batches(U('a', C('a', 'b')), word_format='ids')
+    >>> sorted(tuple(LABELS[i] for i in batch[j]) for j in range(len(batch)))
+    [('a',), ('a', 'b')]
+
+    Args:
+        expression (object): The expression of the words.
+        batch_size (int): The amount of words of each batch.
+        word_format (str): The format of the words of the batches, one of :data:`WORD_FORMATS`.
+        decomposer (Decomposer | None): The decomposer used to interpret the expression. If it is :obj:`None` then an instance of :class:`~.ExtendedDecomposerCompalphabet` will be used.
+        complete_words (bool): Whether only complete words are given, as in :func:`~.words_generator`.
+        word_max_length (int): The maximum length of the words, as in :func:`~.words_generator`.
+        queue_size (int): The maximum amount of batches produced and not taken yet.
+        generator (Callable[..., Iterable[Collection]]): The generator of the words, called as :func:`~.words_generator`, like :func:`~.tail_grouped_words_generator` or :func:`~.parallel_words_generator`.
+    """
+    if (convert := WORD_FORMATS.get(word_format)) is None:
+        raise ValueError(f'unknown word format {word_format!r}, it must be one of {", ".join(WORD_FORMATS)}')
+    if batch_size < 1:
+        raise ValueError('the size of the batches must be positive')
+    if decomposer is None:
+        from pathex.machines.decomposers.extended_decomposer_compalphabet import \
+            ExtendedDecomposerCompalphabet
+        decomposer = ExtendedDecomposerCompalphabet()
+    batches = _get_batches(
+        generator(expression, decomposer, complete_words, word_max_length), batch_size, convert)
+    return batches if queue_size == 0 else _consume(batches, queue_size)
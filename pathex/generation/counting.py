@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import random
+from collections import defaultdict
+
+from pathex.adts.containers.ordered_set import OrderedSet
+from pathex.expressions.nary_operators.union import Union
+from pathex.expressions.terms.empty_word import EMPTY_WORD
+from pathex.machines.compactor import Compactor
+from pathex.machines.decomposers.decomposer import Decomposer
+
+__doc__ = f"""
+
+Words counting and sampling
+===========================
+
+:Module: ``{__name__}``
+
+---------------------------------------------------------------
+
+This module counts the words generated by an expression, draws random ones and finds the shortest one, without generating the language.
+"""
+
+__all__ = ['count_words', 'sample_words', 'shortest_word']
+
+# the state of a key: whether it is final and the letters that follow it, with the keys and states reached by them
+_Expansion = tuple[bool, list[tuple[object, object, object]]]
+
+
+class _Counter:
+
+    def __init__(self, decomposer: Decomposer):
+        self._decomposer = decomposer
+        self._compactor = Compactor()
+        self._expansions: dict[object, _Expansion] = {}
+
+    def get_key(self, state: object) -> object:
+        return self._compactor.get_key(state)
+
+    def expand(self, key: object, state: object) -> _Expansion:
+        if (expansion := self._expansions.get(key)) is None:
+            expansion = self._expansions[key] = self._expand(state)
+        return expansion
+
+    def _expand(self, state: object) -> _Expansion:
+        final = False
+        tails: defaultdict[object, list[object]] = defaultdict(list)
+        alts = OrderedSet([state])
+        # the tails already reached by empty words, since, for instance, the empty word is decomposed into itself
+        visited = set(alts)
+        while alts:
+            exp = alts.popleft()
+            if exp is EMPTY_WORD:
+                final = True
+                continue
+            for head, tail in self._decomposer.transform(exp):
+                if head is not EMPTY_WORD:
+                    tails[head].append(tail)
+                elif tail not in visited:
+                    visited.add(tail)
+                    alts.append(tail)
+        # The tails of the same letter are joined in a single state, so each word is counted once, no matter how many ways the expression generates it.
+        successors = []
+        for head, alternatives in tails.items():
+            if len(alternatives) > 1:
+                alternatives = self._compactor.transform_alternatives(
+                    alternatives)
+            successor = alternatives[0] if len(alternatives) == 1 \
+                else Union(alternatives)
+            successors.append((head, self.get_key(successor), successor))
+        return final, successors
+
+    def get_layers(self, expression: object, length: int) -> list[dict[object, object]]:
+        # the states reached by the words of each length, from 0 to ``length``, by their keys
+        layers = [{self.get_key(expression): expression}]
+        for _ in range(length):
+            layer = {}
+            for key, state in layers[-1].items():
+                for _, successor_key, successor in self.expand(key, state)[1]:
+                    layer.setdefault(successor_key, successor)
+            layers.append(layer)
+        return layers
+
+    def get_completions(self, layers: list[dict[object, object]],
+                        exact: bool) -> list[dict[object, int]]:
+        # The amount of words that complete the ones that reach each state of each layer, with exactly (or at most, if not ``exact``) as many letters as layers follow it.
+        completions: list[dict[object, int]] = [{} for _ in layers]
+        last = len(layers) - 1
+        for i in reversed(range(len(layers))):
+            for key, state in layers[i].items():
+                final, successors = self.expand(key, state)
+                amount = int(final) if i == last or not exact else 0
+                if i < last:
+                    amount += sum(completions[i + 1][successor_key]
+                                  for _, successor_key, _ in successors)
+                completions[i][key] = amount
+        return completions
+
+
+def _get_counter(decomposer: Decomposer | None) -> _Counter:
+    if decomposer is None:
+        from pathex.machines.decomposers.extended_decomposer_compalphabet import \
+            ExtendedDecomposerCompalphabet
+        decomposer = ExtendedDecomposerCompalphabet()
+    return _Counter(decomposer)
+
+
+def count_words(expression: object, max_length: int,
+                decomposer: Decomposer | None = None) -> list[int]:
+    """Gives the amount of different words of each length, from ``0`` to ``max_length``, generated by ``expression``, as :meth:`.Expression.get_language` would give them.
+
+    The words are not generated. Instead, the expression is derived by each letter, joining the derivatives that are the same state, and the amount of words that reach each state is propagated from one length to the next one. So the cost depends on the amount of different states and not on the amount of words, and the counts are exact, however large they are. The derivatives of each state are computed only once.
+
+    .. testsetup::
+
+       from pathex.generation.counting import count_words
+
+    >>> from pathex.expressions.aliases import *
+    >>> count_words(U('a', C('a', 'b'), C('a', 'b')), 3)
+    [0, 1, 1, 0]
+    >>> count_words(S(*'abcdefghij'), 10)[-1]
+    3628800
+    >>> count_words(U('a', 'b')*[0, ...], 64)[64]
+    18446744073709551616
+
+    ``decomposer`` is the machine used to interpret the expression. If it is :obj:`None` then an instance of :class:`~.ExtendedDecomposerCompalphabet` will be used.
+    """
+    counter = _get_counter(decomposer)
+    # the amount of words of the current length that reach each state, by the key of the state
+    layer = {counter.get_key(expression): (expression, 1)}
+    counts = []
+    for length in range(max_length + 1):
+        total = 0
+        next_layer: dict[object, tuple[object, int]] = {}
+        for key, (state, amount) in layer.items():
+            final, successors = counter.expand(key, state)
+            if final:
+                total += amount
+            if length < max_length:
+                for _, successor_key, successor in successors:
+                    if (entry := next_layer.get(successor_key)) is None:
+                        next_layer[successor_key] = (successor, amount)
+                    else:
+                        next_layer[successor_key] = (entry[0], entry[1] + amount)
+        counts.append(total)
+        layer = next_layer
+    return counts
+
+
+def sample_words(expression: object, length: int | None, n: int = 1,
+                 rng: random.Random | None = None, max_length: int = 100,
+                 decomposer: Decomposer | None = None) -> list[tuple]:
+    """Gives ``n`` random words generated by ``expression``, as tuples of letters.
+
+    If ``length`` is an :class:`int`, the words are drawn uniformly among all the words of that length. To do so, the amount of words that complete each state reached by the prefixes of that length is computed first, as in :func:`count_words`, and then each letter is drawn with a probability proportional to the amount of words that follow it, so each word takes a time proportional to its length.
+
+    If ``length`` is :obj:`None`, each word is a random walk through the states of the expression: at each step it is equally probable to end the word, if it is complete, and to follow any letter that leads to some complete word of at most ``max_length`` letters. So short words are much more probable than under a uniform distribution, but words of any length up to ``max_length`` are reached.
+
+    A :class:`ValueError` is raised if there are no words to draw.
+
+    .. testsetup::
+
+       from pathex.generation.counting import sample_words
+
+    >>> import random
+    >>> from collections import Counter
+    >>> from pathex.expressions.aliases import *
+    >>> exp = U(C('a', U('b', 'c', 'd')), C('b', 'c'))
+    >>> words = sample_words(exp, 2, 4000, random.Random(0))
+    >>> sorted(Counter(words))
+    [('a', 'b'), ('a', 'c'), ('a', 'd'), ('b', 'c')]
+    >>> assert all(900 < amount < 1100 for amount in Counter(words).values())
+
+    >>> words = sample_words(C('a', 'b')*[0, ...], None, 100, random.Random(0), max_length=10)
+    >>> assert {len(word) for word in words} <= {0, 2, 4, 6, 8, 10}
+    >>> assert len({len(word) for word in words}) > 2
+
+    >>> sample_words(C('a', 'b'), 3)
+    Traceback (most recent call last):
+        ...
+    ValueError: the expression does not generate words of length 3
+
+    Args:
+        expression (object): The expression of the words.
+        length (int | None): The length of the words, or :obj:`None` to draw words of any length with a random walk.
+        n (int): The amount of words.
+        rng (random.Random | None): The random numbers generator. If it is :obj:`None` a new one is used.
+        max_length (int): The maximum length of the words drawn with a random walk.
+        decomposer (Decomposer | None): The machine used to interpret the expression. If it is :obj:`None` then an instance of :class:`~.ExtendedDecomposerCompalphabet` will be used.
+    """
+    if rng is None:
+        rng = random.Random()
+    counter = _get_counter(decomposer)
+    exact = length is not None
+    layers = counter.get_layers(expression, length if exact else max_length)
+    completions = counter.get_completions(layers, exact)
+    root_key, = layers[0]
+    if not completions[0][root_key]:
+        raise ValueError(f'the expression does not generate words of length {length}' if exact
+                         else f'the expression does not generate words of at most {max_length} letters')
+    words = []
+    for _ in range(n):
+        word = []
+        key, state = root_key, expression
+        for i in range(len(layers) - 1):
+            final, successors = counter.expand(key, state)
+            following = completions[i + 1]
+            if exact:
+                r = rng.randrange(completions[i][key])
+                for head, key, state in successors:
+                    if r < following[key]:
+                        break
+                    r -= following[key]
+            else:
+                options = [s for s in successors if following[s[1]]]
+                if final:
+                    options.append(None)
+                if (choice := rng.choice(options)) is None:
+                    break
+                head, key, state = choice
+            word.append(head)
+        words.append(tuple(word))
+    return words
+
+
+def shortest_word(expression: object, max_length: int | None = None,
+                  decomposer: Decomposer | None = None,
+                  max_states: int | None = None) -> tuple | None:
+    """Gives one of the shortest words generated by ``expression``, as a tuple of letters, or :obj:`None` if it does not generate any word of at most ``max_length`` letters.
+
+    The states of the expression, joined as in :func:`count_words`, are visited in breadth-first order, each one only once, and the search ends at the first complete word. If ``max_length`` and ``max_states`` are :obj:`None` the search is not bounded, so it may not end for an empty language with an unbounded amount of states, as ``a//... & b``. A :class:`ValueError` is raised if more than ``max_states`` states are found.
+
+    .. testsetup::
+
+       from pathex.generation.counting import shortest_word
+
+    >>> from pathex.expressions.aliases import *
+    >>> shortest_word(U(C('a', 'b', 'c'), C('d', 'e')))
+    ('d', 'e')
+    >>> shortest_word(C('a', 'b')*[0, ...] & C('a', 'b', 'a', 'b', _*[0, ...]))
+    ('a', 'b', 'a', 'b')
+    >>> shortest_word(C('a', 'b') & C('a', 'c')) is None
+    True
+    >>> shortest_word(C('a', 'b')//... & 'c', max_length=10) is None
+    True
+    >>> shortest_word(C('a', 'b')//... & C(_*[0, ...], 'c'), max_states=10)
+    Traceback (most recent call last):
+        ...
+    ValueError: more than 10 states found while searching the shortest word
+    """
+    counter = _get_counter(decomposer)
+    root_key = counter.get_key(expression)
+    # the key of the state from which each state was reached first, with the letter that reaches it
+    parents: dict[object, tuple[object, object] | None] = {root_key: None}
+    layer = [(root_key, expression)]
+    length = 0
+    while layer:
+        next_layer = []
+        for key, state in layer:
+            final, successors = counter.expand(key, state)
+            if final:
+                word = []
+                while (parent := parents[key]) is not None:
+                    key, head = parent
+                    word.append(head)
+                return tuple(reversed(word))
+            for head, successor_key, successor in successors:
+                if successor_key not in parents:
+                    parents[successor_key] = (key, head)
+                    next_layer.append((successor_key, successor))
+                    if max_states is not None and len(parents) > max_states:
+                        raise ValueError(
+                            f'more than {max_states} states found while searching the shortest word')
+        if length == max_length:
+            break
+        layer = next_layer
+        length += 1
+    return None
@@ -10,5 +10,7 @@ WORD_TYPE = get_collection_wrapper(list, list.append)
 LANGUAGE_TYPE = SET_OF_STRS
 COLLECTION_TYPE = get_collection_wrapper(
     OrderedSet, OrderedSet.append, None, OrderedSet.popleft, IndexError)
+STACK_TYPE = get_collection_wrapper(list, list.append, list.extend, list.pop, IndexError)
 COMPLETE_WORDS = True
 ALTERNATIVES_TYPE = get_collection_wrapper(deque, deque.append, None, deque.popleft, IndexError)
+MAX_PAIRS = 100_000
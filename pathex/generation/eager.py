@@ -4,21 +4,37 @@ from typing import Collection, Generator
 
 from pathex.adts.collection_wrapper import CollectionWrapper
 from pathex.expressions.terms.empty_word import EMPTY_WORD
+from pathex.machines.compactor import Compactor
 from pathex.machines.decomposers.decomposer import Decomposer
 
 from pathex.generation.defaults import COLLECTION_TYPE, COMPLETE_WORDS, WORD_MAX_LENGTH
-from pathex.adts.containers.onion_collection import EmptyOnionCollection, NonemptyOnionCollection
+from pathex.adts.containers.onion_collection import EmptyOnionCollection, NonemptyOnionCollection, OnionCollection
 
-__all__ = ['words_generator']
+__all__ = ['words_generator', 'iterative_deepening_words_generator',
+           'tail_grouped_words_generator']
 
 
 def words_generator(expression: object, machine: Decomposer,
                     complete_words: bool = COMPLETE_WORDS,
                     word_max_length: int = WORD_MAX_LENGTH,
                     partial_words_type: type[CollectionWrapper] = COLLECTION_TYPE) -> Generator[Collection, None, None]:
+    """Generates the words of ``expression``, as :class:`~.OnionCollection` objects.
 
+    The partial words still to be extended are kept in a collection of type ``partial_words_type``. The default one is a queue, so the words are generated in breadth-first order, but the whole frontier of partial words is kept, which grows exponentially with the length of the words of branchy expressions. With a stack, like :data:`~.STACK_TYPE`, the words are generated in depth-first order and only the alternatives of the partial words of the current path are kept, so the memory is proportional to ``word_max_length`` times the amount of alternatives of each step. As a path may be infinite, ``word_max_length`` should be given then. See also :func:`iterative_deepening_words_generator`. With a :class:`~.DiskQueue` the frontier is kept in a file, and the generation may be resumed from its last checkpoint, since the generation continues from the partial words of a collection that is not empty.
+
+    >>> from pathex.expressions.aliases import *
+    >>> from pathex.generation.defaults import STACK_TYPE
+    >>> from pathex.machines.decomposers.extended_decomposer_compalphabet import ExtendedDecomposerCompalphabet
+    >>> words = words_generator(U('a', 'b')+..., ExtendedDecomposerCompalphabet(), word_max_length=3, partial_words_type=STACK_TYPE)
+    >>> [''.join(w) for w in words]
+    ['b', 'bb', 'ba', 'a', 'ab', 'aa']
+
+    ``machine`` is the decomposer used to interpret the expression. If ``complete_words`` is false, the partial words that can not be extended, because they are dead ends or because they reached ``word_max_length`` letters, are also given. If ``word_max_length`` is not positive the length of the words is not bounded.
+    """
     partial_words = partial_words_type()
-    partial_words.put((EmptyOnionCollection(), expression))
+    # a collection that is not empty holds the partial words of a generation to be resumed, as a DiskQueue from a checkpoint
+    if not partial_words:
+        partial_words.put((EmptyOnionCollection(), expression))
 
     while True:
         try:
@@ -40,3 +56,133 @@ def words_generator(expression: object, machine: Decomposer,
                         partial_words.put((new_prefix, tail))
             if tail is None and not complete_words:
                 yield prefix
+
+
+def iterative_deepening_words_generator(expression: object, machine: Decomposer,
+                                        complete_words: bool = COMPLETE_WORDS,
+                                        word_max_length: int = WORD_MAX_LENGTH) -> Generator[Collection, None, None]:
+    """Generates the words of ``expression`` level by level, as :func:`words_generator` does by default, but keeping only the alternatives of the current path, as the depth-first generation does.
+
+    The expression is explored in depth-first order once for each maximum length of the prefixes, from ``0`` to ``word_max_length``, and each exploration gives only the words that were not reached by the previous ones. So the memory is proportional to the length of the words times the amount of alternatives of each step, as in the depth-first generation, while the words are given level by level, as in the breadth-first generation, so the words of infinite languages may be consumed without bounding their length. The price is that the shorter prefixes are decomposed again at each exploration. If ``word_max_length`` is not positive, the generation ends when an exploration does not reach its length, so it never ends for infinite languages.
+
+    .. testsetup::
+
+       from pathex.generation.eager import iterative_deepening_words_generator, words_generator
+
+    >>> from pathex.expressions.aliases import *
+    >>> from pathex.machines.decomposers.extended_decomposer_compalphabet import ExtendedDecomposerCompalphabet
+    >>> decomposer = ExtendedDecomposerCompalphabet()
+    >>> [''.join(w) for w in iterative_deepening_words_generator(U('a', 'b')+..., decomposer, word_max_length=3)]
+    ['b', 'a', 'bb', 'ba', 'ab', 'aa']
+    >>> exp = S(C('a', 'b')*[1, 2], 'c', U('d', C('e', 'f')))
+    >>> words = iterative_deepening_words_generator(exp, decomposer)
+    >>> assert {''.join(w) for w in words} == {''.join(w) for w in words_generator(exp, decomposer)}
+    >>> words = iterative_deepening_words_generator(exp, decomposer, False, 3)
+    >>> assert {''.join(w) for w in words} == {''.join(w) for w in words_generator(exp, decomposer, False, 3)}
+
+    The arguments mean the same as in :func:`words_generator`.
+    """
+    depth = 0
+    while True:
+        last = depth == word_max_length
+        truncated = False
+        # The pending partial words of the current exploration, with whether they are reached for the first time in it, which happens when their parents have the maximum length of the previous exploration. Each word is given only in the exploration that reaches it first.
+        partial_words: list[tuple[OnionCollection, object, bool]] = [
+            (EmptyOnionCollection(), expression, depth == 0)]
+        while partial_words:
+            prefix, tail, new = partial_words.pop()
+            if len(prefix) < depth:
+                alts = machine.transform(tail)
+                tail = None
+                children_new = len(prefix) == depth - 1
+                for head, tail in alts:
+                    if head is not EMPTY_WORD:
+                        new_prefix = NonemptyOnionCollection(prefix, head)
+                    else:
+                        new_prefix = prefix
+                    if tail is EMPTY_WORD:
+                        if children_new:
+                            yield new_prefix
+                    else:
+                        partial_words.append((new_prefix, tail, children_new))
+                # the dead ends are given at the first exploration that extends them
+                if tail is None and not complete_words and children_new:
+                    yield prefix
+            else:
+                truncated = True
+                if last and not complete_words:
+                    yield prefix
+        if last or not truncated:
+            break
+        depth += 1
+
+
+def tail_grouped_words_generator(expression: object, machine: Decomposer,
+                                 complete_words: bool = COMPLETE_WORDS,
+                                 word_max_length: int = WORD_MAX_LENGTH) -> Generator[Collection, None, None]:
+    """Generates the words of ``expression`` level by level, as :func:`words_generator` does by default, but decomposing each distinct tail only once.
+
+    The partial words of each level are grouped by their tails, and the alternatives of each tail are computed only the first time it is reached, so the generation is a walk over the graph of the distinct states of the expression, and the prefixes of the words are extended along it. Since the prefixes are :class:`~.OnionCollection` objects, the ones of a group share their common parts, as a trie. This saves most of the decompositions of expressions whose tails are reached by many prefixes, like shuffles, at the cost of keeping the alternatives of every tail reached.
+
+    .. testsetup::
+
+       from pathex.generation.eager import tail_grouped_words_generator, words_generator
+
+    >>> from pathex.expressions.aliases import *
+    >>> from pathex.machines.decomposers.extended_decomposer_compalphabet import ExtendedDecomposerCompalphabet
+    >>> decomposer = ExtendedDecomposerCompalphabet()
+    >>> [''.join(w) for w in tail_grouped_words_generator(U('a', 'b')+..., decomposer, word_max_length=3)]
+    ['a', 'b', 'aa', 'ba', 'ab', 'bb']
+    >>> exp = S(C('a', 'b')*[1, 2], 'c', U('d', C('e', 'f')))
+    >>> words = tail_grouped_words_generator(exp, decomposer)
+    >>> assert {''.join(w) for w in words} == {''.join(w) for w in words_generator(exp, decomposer)}
+    >>> words = tail_grouped_words_generator(exp, decomposer, False, 3)
+    >>> assert {''.join(w) for w in words} == {''.join(w) for w in words_generator(exp, decomposer, False, 3)}
+
+    The arguments mean the same as in :func:`words_generator`.
+    """
+    # Tails are grouped by their keys, since expressions of different classes with the same arguments compare equal. The alternatives of each key are the ones of the first tail reached with it.
+    compactor = Compactor()
+    alternatives: dict[object, list[tuple[object, object]]] = {}
+    layer = _get_first_layer(expression, compactor)
+    while layer:
+        layer = yield from _expand_layer(layer, machine, compactor, alternatives,
+                                         complete_words, word_max_length)
+
+
+# the tails of the partial words of a level, with their prefixes, by the keys of the tails
+_Layer = dict[object, tuple[object, dict[OnionCollection, None]]]
+
+
+def _get_first_layer(expression: object, compactor: Compactor) -> _Layer:
+    return {compactor.get_key(expression): (expression, {EmptyOnionCollection(): None})}
+
+
+def _expand_layer(layer: _Layer, machine: Decomposer, compactor: Compactor,
+                  alternatives: dict[object, list[tuple[object, object]]],
+                  complete_words: bool, word_max_length: int) -> Generator[Collection, None, _Layer]:
+    # generates the words completed by the alternatives of the tails of ``layer`` and returns the next layer
+    next_layer: _Layer = {}
+    for key, (tail, prefixes) in layer.items():
+        if word_max_length > 0:
+            if not complete_words:
+                yield from (prefix for prefix in prefixes if len(prefix) >= word_max_length)
+            prefixes = [prefix for prefix in prefixes if len(prefix) < word_max_length]
+            if not prefixes:
+                continue
+        if (alts := alternatives.get(key)) is None:
+            alts = alternatives[key] = list(machine.transform(tail))
+        if not alts and not complete_words:
+            yield from prefixes
+        for head, new_tail in alts:
+            if head is not EMPTY_WORD:
+                new_prefixes = [NonemptyOnionCollection(prefix, head) for prefix in prefixes]
+            else:
+                new_prefixes = prefixes
+            if new_tail is EMPTY_WORD:
+                yield from new_prefixes
+            elif (group := next_layer.get(new_key := compactor.get_key(new_tail))) is None:
+                next_layer[new_key] = (new_tail, dict.fromkeys(new_prefixes))
+            else:
+                group[1].update(dict.fromkeys(new_prefixes))
+    return next_layer
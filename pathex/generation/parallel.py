@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from typing import Collection, Generator
+
+from pathex.adts.containers.onion_collection import (NonemptyOnionCollection,
+                                                     OnionCollection)
+from pathex.generation.defaults import COMPLETE_WORDS, WORD_MAX_LENGTH
+from pathex.generation.eager import (_expand_layer, _get_first_layer,
+                                     tail_grouped_words_generator)
+from pathex.machines.compactor import Compactor
+from pathex.machines.decomposers.decomposer import Decomposer
+
+__doc__ = f"""
+
+Parallel words generation
+=========================
+
+:Module: ``{__name__}``
+
+---------------------------------------------------------------
+
+This module generates the words of an expression in several processes.
+"""
+
+__all__ = ['parallel_words_generator']
+
+TASKS_PER_WORKER = 4
+MAX_SPLIT_LEVELS = 16
+
+
+def _generate_suffixes(tail: object, machine: Decomposer, complete_words: bool,
+                       word_max_length: int) -> list[tuple]:
+    # runs in the worker processes
+    return [tuple(word) for word in
+            tail_grouped_words_generator(tail, machine, complete_words, word_max_length)]
+
+
+def parallel_words_generator(expression: object, machine: Decomposer,
+                             complete_words: bool = COMPLETE_WORDS,
+                             word_max_length: int = WORD_MAX_LENGTH,
+                             max_workers: int | None = None,
+                             executor: Executor | None = None) -> Generator[Collection, None, None]:
+    """Generates the words of ``expression``, as :func:`~.words_generator` does, but in several processes.
+
+    The first levels of the words are generated in this process, as :func:`~.tail_grouped_words_generator` does, until there are :data:`TASKS_PER_WORKER` distinct tails for each worker, or :data:`MAX_SPLIT_LEVELS` levels have been generated. Then each tail, with the prefixes of the same length that reach it, is an independent task: a worker generates the words of the tail, which are joined to each one of its prefixes in this process. The words of each task are given as soon as it is finished, so the order of the words is not the one of :func:`~.words_generator`. Since the words of each tail are generated once, no matter how many prefixes reach it, the words of the tasks may be much more than the ones sent back by the workers.
+
+    The expression, the decomposer and the letters must be picklable. As tasks are the words of whole tails, an infinite language gives tasks that never end, so ``word_max_length`` should be given then.
+
+    .. testsetup::
+
+       from pathex.generation.parallel import parallel_words_generator
+
+    >>> from pathex.expressions.aliases import *
+    >>> from pathex.machines.decomposers.extended_decomposer_compalphabet import ExtendedDecomposerCompalphabet
+    >>> exp = S(C('a', 'b'), C('c', 'd'), U('e', 'f'))
+    >>> words = parallel_words_generator(exp, ExtendedDecomposerCompalphabet(), max_workers=2)
+    >>> assert {''.join(w) for w in words} == exp.get_language()
+    >>> words = parallel_words_generator(U('a', 'b')+..., ExtendedDecomposerCompalphabet(), word_max_length=4, max_workers=2)
+    >>> sorted(''.join(w) for w in words if len(w) == 3)
+    ['aaa', 'aab', 'aba', 'abb', 'baa', 'bab', 'bba', 'bbb']
+
+    Args:
+        expression (object): The expression of the words.
+        machine (Decomposer): The decomposer used to interpret the expression.
+        complete_words (bool): Whether only complete words are given, as in :func:`~.words_generator`.
+        word_max_length (int): The maximum length of the words, as in :func:`~.words_generator`.
+        max_workers (int | None): The amount of worker processes. If it is :obj:`None` the amount of processors is used.
+        executor (Executor | None): The executor that runs the tasks. If it is :obj:`None`, a :class:`~concurrent.futures.ProcessPoolExecutor` with ``max_workers`` workers is used, and shut down at the end.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    compactor = Compactor()
+    alternatives: dict[object, list[tuple[object, object]]] = {}
+    layer = _get_first_layer(expression, compactor)
+    for _ in range(MAX_SPLIT_LEVELS):
+        if not layer or len(layer) >= max_workers * TASKS_PER_WORKER:
+            break
+        layer = yield from _expand_layer(layer, machine, compactor, alternatives,
+                                         complete_words, word_max_length)
+    # the tasks: a tail with the prefixes of the same length that reach it
+    tasks: list[tuple[object, int, list[OnionCollection]]] = []
+    for tail, prefixes in layer.values():
+        by_length: defaultdict[int, list[OnionCollection]] = defaultdict(list)
+        for prefix in prefixes:
+            by_length[len(prefix)].append(prefix)
+        for length, prefixes_ in by_length.items():
+            if word_max_length <= 0:
+                tasks.append((tail, word_max_length, prefixes_))
+            elif length < word_max_length:
+                tasks.append((tail, word_max_length - length, prefixes_))
+            elif not complete_words:
+                yield from prefixes_
+    if not tasks:
+        return
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers)
+    try:
+        futures = {executor.submit(_generate_suffixes, tail, machine, complete_words, remaining): prefixes
+                   for tail, remaining, prefixes in tasks}
+        for future in as_completed(futures):
+            suffixes = future.result()
+            for prefix in futures[future]:
+                for suffix in suffixes:
+                    word = prefix
+                    for letter in suffix:
+                        word = NonemptyOnionCollection(word, letter)
+                    yield word
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
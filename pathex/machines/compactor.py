@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from collections import Counter
+from functools import singledispatchmethod
+from typing import Iterable
+
+from pathex.expressions.nary_operators.concatenation import Concatenation
+from pathex.expressions.nary_operators.difference import Difference
+from pathex.expressions.nary_operators.intersection import Intersection
+from pathex.expressions.nary_operators.nary_operator import NAryOperator
+from pathex.expressions.nary_operators.shuffle import Shuffle
+from pathex.expressions.nary_operators.union import Union
+from pathex.expressions.repetitions.repetition import Repetition
+from pathex.expressions.terms.empty_word import EMPTY_WORD
+from pathex.machines.machine import Machine
+
+__all__ = ['Compactor']
+
+# the operators whose subclasses, like :class:`~.Tag`, are rebuilt and compared as the operator itself, since their constructors may take other arguments
+_OPERATORS = (Concatenation, Shuffle, Union, Intersection, Difference)
+
+
+def _get_operator(exp: NAryOperator) -> type[NAryOperator]:
+    for cls in _OPERATORS:
+        if isinstance(exp, cls):
+            return cls
+    return type(exp)
+
+
+class Compactor(Machine):
+    """A machine that gives a smaller expression with the same language.
+
+    Expressions are compared by a canonical key, that does not depend on the order of the arguments of unions, intersections and shuffles, nor on repeated arguments of unions and intersections. The alternatives of unions with the same key are removed, as well as the ones whose language is contained in the one of another alternative, according to some cheap syntactic rules: ``a`` is contained in ``a+...``, ``a+[m, n]`` is contained in ``b+[k, l]`` if ``a`` is contained in ``b`` and ``[m, n]`` in ``[k, l]``, and every operator, but the subtracted arguments of a difference, preserves the containment of its arguments. Empty words are also removed from concatenations and shuffles, and ``EMPTY_WORD | a+[1, n]`` is replaced by ``a+[0, n]``.
+
+    .. testsetup::
+
+       from pathex.machines.compactor import Compactor
+
+    >>> from pathex.expressions.aliases import *
+    >>> compactor = Compactor()
+    >>> assert compactor.transform(U(S('a', 'b'), S('b', 'a'), C('a', 'b'))) == U(S('a', 'b'), C('a', 'b'))
+    >>> assert compactor.transform(U(C('a', 'b'), C('a', 'b')+...)) == C('a', 'b')+...
+    >>> assert compactor.transform(U(E, SR('a', 1))) == SR('a', 0)
+    >>> assert compactor.transform(U(S(SR('a', 0), 'b'), S('b', U(E, SR('a', 1))))) == S(SR('a', 0), 'b')
+
+    Subclasses of the operators are given as the operator itself, so they keep their language:
+
+    >>> from pathex.managing.tag import Tag
+    >>> compactor.transform(Tag('t'))
+    Concatenation('t.enter', 't.exit')
+    >>> assert compactor.transform(S(Tag('t'), 'a')).get_language() == S(Tag('t'), 'a').get_language()
+    >>> assert compactor.get_key(Tag('t')) == compactor.get_key(C('t.enter', 't.exit'))
+    """
+
+    def __init__(self):
+        # keys are cached by the identity of the expressions only while transforming
+        self._keys: dict[int, tuple[object, object]] | None = None
+
+    def transform(self, exp: object) -> object:
+        self._keys = {}
+        try:
+            return self._transform(exp)
+        finally:
+            self._keys = None
+
+    def transform_alternatives(self, alternatives: Iterable[object]) -> list[object]:
+        """Gives the compacted alternatives of a union whose arguments are ``alternatives``, that is, the alternatives that remain after transforming them and removing the ones contained in others."""
+        self._keys = {}
+        try:
+            return self._prune(self._transform(a) for a in alternatives)
+        finally:
+            self._keys = None
+
+    def get_key(self, exp: object) -> object:
+        """Gives the canonical key of ``exp``. Expressions with the same key have the same language.
+
+        Keys are only cached while transforming, so they do not keep expressions alive.
+        """
+        keys = self._keys
+        if keys is not None and (cached := keys.get(id(exp))) is not None:
+            return cached[1]
+        if isinstance(exp, (Union, Intersection)):
+            key = (_get_operator(exp), frozenset(map(self.get_key, exp.arguments)))
+        elif isinstance(exp, Shuffle):
+            key = (Shuffle, frozenset(
+                Counter(map(self.get_key, exp.arguments)).items()))
+        elif isinstance(exp, NAryOperator):
+            key = (_get_operator(exp), tuple(map(self.get_key, exp.arguments)))
+        elif isinstance(exp, Repetition):
+            key = (type(exp), self.get_key(exp.argument),
+                   exp.lower_bound, exp.upper_bound)
+        else:
+            return exp
+        if keys is not None:
+            # the expression is kept, so its identity is not reused while cached
+            keys[id(exp)] = (exp, key)
+        return key
+
+    def contains(self, exp1: object, exp2: object) -> bool:
+        """Gives whether the language of ``exp1`` surely contains the one of ``exp2``. A :obj:`False` result means that it is unknown."""
+        if self.get_key(exp1) == self.get_key(exp2):
+            return True
+        if isinstance(exp2, Union):
+            return all(self.contains(exp1, e) for e in exp2.arguments)
+        if isinstance(exp1, Union):
+            return any(self.contains(e, exp2) for e in exp1.arguments)
+        if isinstance(exp1, Repetition):
+            if type(exp2) is type(exp1) and \
+                    exp1.lower_bound <= exp2.lower_bound and \
+                    exp2.upper_bound <= exp1.upper_bound and \
+                    self.contains(exp1.argument, exp2.argument):
+                return True
+            if exp2 is EMPTY_WORD:
+                return exp1.lower_bound == 0
+            return exp1.lower_bound <= 1 <= exp1.upper_bound and \
+                self.contains(exp1.argument, exp2)
+        if not isinstance(exp1, NAryOperator) or not isinstance(exp2, NAryOperator) or \
+                _get_operator(exp1) is not _get_operator(exp2):
+            return False
+        args1, args2 = exp1.arguments, exp2.arguments
+        if isinstance(exp1, Intersection):
+            return all(any(self.contains(e1, e2) for e2 in args2) for e1 in args1)
+        if len(args1) != len(args2):
+            return False
+        if isinstance(exp1, Shuffle):
+            # each argument of ``exp2`` must be contained in a different argument of ``exp1``
+            pending = list(args1)
+            for e2 in args2:
+                for i, e1 in enumerate(pending):
+                    if self.contains(e1, e2):
+                        del pending[i]
+                        break
+                else:
+                    return False
+            return True
+        if isinstance(exp1, Difference):
+            return self.contains(args1[0], args2[0]) and \
+                all(self.get_key(e1) == self.get_key(e2)
+                    for e1, e2 in zip(args1[1:], args2[1:]))
+        if isinstance(exp1, Concatenation):
+            return all(self.contains(e1, e2) for e1, e2 in zip(args1, args2))
+        return False
+
+    def _prune(self, alternatives: Iterable[object]) -> list[object]:
+        unique = {}
+        for a in alternatives:
+            unique.setdefault(self.get_key(a), a)
+        kept = []
+        for a in unique.values():
+            if not any(self.contains(k, a) for k in kept):
+                kept = [k for k in kept if not self.contains(a, k)]
+                kept.append(a)
+        return kept
+
+    def _args_transformer(self, args: Iterable[object]) -> list[object]:
+        return [self._transform(a) for a in args]
+
+    def _give_nary(self, cls: type[NAryOperator], args: list[object]) -> object:
+        if len(args) == 1:
+            return args[0]
+        else:
+            return cls(args)
+
+    @singledispatchmethod
+    def _transform(self, exp: object) -> object:
+        return exp
+
+    @_transform.register(NAryOperator)
+    def _transform_nary(self, exp: NAryOperator):
+        return _get_operator(exp)(self._args_transformer(exp.arguments))
+
+    @_transform.register(Union)
+    def _transform_union(self, exp: Union):
+        args = self._args_transformer(exp.arguments)
+        if any(a is EMPTY_WORD for a in args):
+            for i, a in enumerate(args):
+                # EMPTY_WORD | a+[1, n] == a+[0, n]
+                if isinstance(a, Repetition) and a.lower_bound == 1:
+                    args[i] = a.__class__(a.argument, 0, a.upper_bound)
+        return self._give_nary(Union, self._prune(args))
+
+    @_transform.register(Intersection)
+    def _transform_intersection(self, exp: Intersection):
+        unique = {}
+        for a in self._args_transformer(exp.arguments):
+            unique.setdefault(self.get_key(a), a)
+        return self._give_nary(Intersection, list(unique.values()))
+
+    def _transform_without_empty_words(self, exp: Concatenation | Shuffle):
+        args = [a for a in self._args_transformer(exp.arguments)
+                if a is not EMPTY_WORD]
+        if not args:
+            return EMPTY_WORD
+        return self._give_nary(_get_operator(exp), args)
+
+    _transform.register(Concatenation, _transform_without_empty_words)
+    _transform.register(Shuffle, _transform_without_empty_words)
+
+    @_transform.register(Repetition)
+    def _transform_repetition(self, exp: Repetition):
+        return exp.__class__(self._transform(exp.argument),
+                             exp.lower_bound, exp.upper_bound)
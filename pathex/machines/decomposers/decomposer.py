@@ -13,7 +13,9 @@ Branches = Iterator[tuple[object, object]]
 class Decomposer(Machine):
 
     def __init_subclass__(cls):
-        cls._populate_transformer()
+        # subclasses that do not register visitors share the transformer of their parent
+        if '_populate_transformer' in cls.__dict__:
+            cls._populate_transformer()
 
     @classmethod
     def _populate_transformer(cls): ...
@@ -1,4 +1,12 @@
-from .synchronizer import *
-from .tag import *
-from .processes import *
-from .concurrent import *
+from pathex.adts.lazy import lazy_attributes
+
+__all__, __getattr__, __dir__ = lazy_attributes(__name__, {
+    '.synchronizer': ['Synchronizer'],
+    '.shared_synchronizer': ['SharedSynchronizer'],
+    '.tag': ['Tag'],
+    '.processes': ['get_mp_process_manager', 'SynchronizerProxy',
+                   'PipelinedSynchronizerProxy'],
+    '.concurrent': ['Concurrent'],
+    '.specification': ['Specification'],
+    '.executor': ['SynchronizedExecutor'],
+})
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Hashable, Iterable
+
+from pathex.adts.containers.ordered_set import OrderedSet
+from pathex.machines.compactor import Compactor
+from pathex.expressions.nary_operators.nary_operator import NAryOperator
+from pathex.expressions.nary_operators.union import Union
+from pathex.expressions.repetitions.repetition import Repetition
+from pathex.expressions.terms.letter import Letter
+from pathex.expressions.terms.letters_complement import LettersComplement
+from pathex.expressions.terms.term import Term
+
+__all__ = ['Automaton', 'get_labels', 'MAX_STATES', 'NO_TRANSITION']
+
+_compactor = Compactor()
+
+MAX_STATES = 1000
+NO_TRANSITION = -1
+
+
+def get_labels(expression: object) -> OrderedSet:
+    """Gives the concrete labels that appear in ``expression``, in order of appearance.
+
+    .. testsetup::
+
+       from pathex.managing.automaton import get_labels
+
+    >>> from pathex import Tag
+    >>> from pathex.expressions.aliases import *
+    >>> a, b = Tag.named('a', 'b')
+    >>> assert get_labels((a | b//...)+...) == ['a.enter', 'a.exit', 'b.enter', 'b.exit']
+    >>> assert get_labels(C('xy', _) - LC('z')) == ['xy', 'z']
+    """
+    labels = OrderedSet()
+    pending = [expression]
+    while pending:
+        exp = pending.pop()
+        if isinstance(exp, NAryOperator):
+            pending.extend(reversed(exp.arguments))
+        elif isinstance(exp, Repetition):
+            pending.append(exp.argument)
+        elif isinstance(exp, Letter):
+            labels.append(exp.value)
+        elif isinstance(exp, LettersComplement):
+            labels.extend(exp.letters)
+        elif not isinstance(exp, Term):
+            labels.append(exp)
+    return labels
+
+
+def _get_key(state: object) -> object:
+    # alternatives that differ only in order or repetition represent the same state
+    return _compactor.get_key(state if isinstance(state, Union) else Union((state,)))
+
+
+@dataclass(frozen=True)
+class Automaton:
+    """A deterministic finite automaton compiled from the states of a manager.
+
+    States are represented by consecutive integers, being ``0`` the initial one. ``transitions[state][i]`` is the state reached by matching ``labels[i]`` from ``state``, or :data:`NO_TRANSITION` if that label is not allowed in ``state``. ``enabled[state]`` has the indexes of the labels allowed in ``state``, in increasing order.
+
+    >>> from pathex import Tag
+    >>> from pathex.managing.automaton import Automaton
+    >>> from pathex.managing.specification import Specification
+    >>> a, b = Tag.named('a', 'b')
+    >>> automaton = Specification(+(a | b)).compile([a.enter, a.exit, b.enter, b.exit])
+    >>> automaton.enabled
+    ((0, 2), (1,), (3,), (0, 2))
+    """
+    labels: tuple
+    transitions: tuple[tuple[int, ...], ...]
+    index: dict[object, int] = field(init=False, repr=False, compare=False)
+    enabled: tuple[tuple[int, ...], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'index',
+                           {label: i for i, label in enumerate(self.labels)})
+        object.__setattr__(self, 'enabled',
+                           tuple(tuple(i for i, target in enumerate(row) if target != NO_TRANSITION)
+                                 for row in self.transitions))
+
+    @classmethod
+    def compile(cls, initial: object,
+                derive: Callable[[object, object], object | None],
+                labels: Iterable[Hashable],
+                max_states: int = MAX_STATES) -> Automaton:
+        """Explores every state reachable from ``initial`` by matching ``labels``.
+
+        ``derive(state, label)`` must give the state reached by matching ``label`` from ``state``, or :obj:`None` if it can not be matched.
+
+        A :class:`ValueError` is raised if more than ``max_states`` states are found, as it is the case of expressions with an unbounded amount of states, like ``a//...``.
+        """
+        labels = tuple(OrderedSet(labels))
+        keys = {_get_key(initial): 0}
+        states = [initial]
+        transitions = []
+        for state in states:  # ``states`` grows while being iterated
+            row = []
+            for label in labels:
+                target = derive(state, label)
+                if target is None:
+                    row.append(NO_TRANSITION)
+                    continue
+                key = _get_key(target)
+                if (j := keys.get(key)) is None:
+                    if len(states) == max_states:
+                        raise ValueError(
+                            f'more than {max_states} states found while compiling the automaton')
+                    j = keys[key] = len(states)
+                    states.append(target)
+                row.append(j)
+            transitions.append(tuple(row))
+        return cls(labels, tuple(transitions))
+
+    def step(self, state: int, label: object) -> int:
+        """Gives the state reached by matching ``label`` from ``state``, or :data:`NO_TRANSITION`.
+
+        A :class:`KeyError` is raised if ``label`` is not in :attr:`labels`.
+        """
+        return self.transitions[state][self.index[label]]
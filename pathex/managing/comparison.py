@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import deque
+
+from pathex.adts.containers.ordered_set import OrderedSet
+from pathex.adts.singleton import singleton
+from pathex.expressions.terms.letters_complement import LettersComplement
+from pathex.generation.defaults import MAX_PAIRS
+from pathex.machines.compactor import Compactor
+from pathex.machines.decomposers.decomposer import DecomposerMatch
+from pathex.managing.automaton import get_labels
+from pathex.managing.specification import Specification
+
+__all__ = ['get_counterexample', 'MAX_PAIRS']
+
+
+@singleton
+class _OtherLabel:
+    """The instance of this class stands for every label that does not appear in the compared expressions, as all of them are matched in the same way."""
+
+    def __repr__(self) -> str:
+        return '<OTHER>'
+
+
+_OTHER_LABEL = _OtherLabel()
+
+
+class _Side:
+    # one of the compared specifications, with the finality of its states
+
+    def __init__(self, spec: Specification):
+        self.spec = spec
+        self._compactor = Compactor()
+        self._finals: dict[object, bool] = {}
+
+    def get_key(self, state: object | None) -> object | None:
+        # states that can not be reached are represented by None
+        return None if state is None else self._compactor.get_key(state)
+
+    def derive(self, state: object | None, label: object) -> object | None:
+        return None if state is None else self.spec.derive(state, label)
+
+    def is_final(self, key: object | None, state: object | None) -> bool:
+        if state is None:
+            return False
+        if (final := self._finals.get(key)) is None:
+            final = self._finals[key] = self.spec.is_final(state)
+        return final
+
+
+def _get_spec(exp: object, decomposer: DecomposerMatch | None) -> Specification:
+    return exp if isinstance(exp, Specification) else Specification(exp, decomposer)
+
+
+def get_counterexample(exp1: object, exp2: object, subset: bool = False,
+                       decomposer: DecomposerMatch | None = None,
+                       max_pairs: int = MAX_PAIRS) -> tuple | None:
+    """Gives a word generated by ``exp1`` and not by ``exp2`` or, if ``subset`` is false, also a word generated by ``exp2`` and not by ``exp1``. If there is no such word, :obj:`None` is given, so the language of ``exp1`` is contained in (or, if ``subset`` is false, equal to) the one of ``exp2``.
+
+    The languages are never enumerated. Instead, both expressions are derived at the same time by each label that appears in any of them, and by a label that stands for every other one, and the pairs of states reached are explored in breadth-first order until a pair with a complete word of only one of the expressions is found. So the search ends at the first counterexample, and infinite languages are compared as long as their amount of states is finite. Equivalence is checked as in the algorithm of Hopcroft and Karp: the states of both expressions that are assumed to be equivalent are joined with a union-find structure, so each pair of states is explored only if its states are not equivalent yet, and each state is explored about once. Inclusion is checked by exploring each pair of states once.
+
+    A counterexample may contain a :class:`~.LettersComplement` of the labels of the expressions, meaning any label that is not one of them.
+
+    Expressions with an unbounded amount of states, like the ones with shuffle closures as ``a//...``, can not be compared: a :class:`ValueError` is raised if more than ``max_pairs`` pairs of states are explored. As the states of such expressions grow with each label, reaching the default bound may take minutes, for instance with ``(w | r//...)+...``, so a smaller ``max_pairs`` should be given to fail early.
+
+    .. testsetup::
+
+       from pathex.managing.comparison import get_counterexample
+
+    >>> from pathex.expressions.aliases import *
+    >>> get_counterexample(C('a', 'b')+..., C('a', 'b') + C('a', 'b')*[0, ...]) is None
+    True
+    >>> get_counterexample(C('a', 'b')+..., C('a', 'b')+2)
+    ('a', 'b')
+    >>> get_counterexample(C('a', 'b')+2, C('a', 'b')+..., subset=True) is None
+    True
+    >>> get_counterexample(U('a', C('b', _)), U('a', C('b', 'c')))
+    ('b', 'a')
+    >>> word = get_counterexample(U('a', C('b', _)), U('a', C('b', U('a', 'b', 'c'))))
+    >>> word[0], sorted(word[1].letters)
+    ('b', ['a', 'b', 'c'])
+    >>> get_counterexample(C('a', 'b')//..., C('a', 'b')//..., max_pairs=10)
+    Traceback (most recent call last):
+        ...
+    ValueError: more than 10 pairs of states found while comparing the expressions
+
+    Args:
+        exp1 (object): An expression, or a :class:`~.Specification`.
+        exp2 (object): An expression, or a :class:`~.Specification`.
+        subset (bool): Whether only words of ``exp1`` are searched.
+        decomposer (DecomposerMatch | None): The decomposer used to derive the expressions that are not specifications. If it is :obj:`None` an instance of :class:`~.ExtendedDecomposerCompalphabet` is used.
+        max_pairs (int): The maximum amount of pairs of states to be explored.
+    """
+    side1 = _Side(_get_spec(exp1, decomposer))
+    side2 = _Side(_get_spec(exp2, decomposer))
+    labels = OrderedSet(get_labels(side1.spec.expression))
+    labels.extend(get_labels(side2.spec.expression))
+    concrete = tuple(labels)
+    labels.append(_OTHER_LABEL)
+
+    # the representative of the class of each state assumed to be equivalent, by the side and the key of the state
+    parents: dict[tuple[int, object], tuple[int, object]] = {}
+
+    def find(x: tuple[int, object]) -> tuple[int, object]:
+        root = x
+        while (parent := parents.get(root, root)) != root:
+            root = parent
+        while x != root:  # path compression
+            parents[x], x = root, parents.get(x, x)
+        return root
+
+    state1, state2 = side1.spec.initial_state, side2.spec.initial_state
+    key1, key2 = side1.get_key(state1), side2.get_key(state2)
+    visited = {(key1, key2)}
+    parents[(0, key1)] = (1, key2)
+    # each word is kept as a linked list, from its last label, to share its prefix with other words
+    pending = deque([(state1, key1, state2, key2, None)])
+    while pending:
+        state1, key1, state2, key2, word = pending.popleft()
+        final1 = side1.is_final(key1, state1)
+        final2 = side2.is_final(key2, state2)
+        if final1 and not final2 or final2 and not final1 and not subset:
+            labels_ = []
+            while word is not None:
+                label, word = word
+                labels_.append(LettersComplement(concrete)
+                               if label is _OTHER_LABEL else label)
+            return tuple(reversed(labels_))
+        for label in labels:
+            derived1 = side1.derive(state1, label)
+            if derived1 is None and (subset or state2 is None):
+                continue
+            derived2 = side2.derive(state2, label)
+            if derived1 is None and derived2 is None:
+                continue
+            derived_key1, derived_key2 = side1.get_key(derived1), side2.get_key(derived2)
+            if subset:
+                if (derived_key1, derived_key2) in visited:
+                    continue
+                visited.add((derived_key1, derived_key2))
+            else:
+                root1, root2 = find((0, derived_key1)), find((1, derived_key2))
+                if root1 == root2:
+                    continue
+                parents[root1] = root2
+                visited.add((derived_key1, derived_key2))
+            if len(visited) > max_pairs:
+                raise ValueError(
+                    f'more than {max_pairs} pairs of states found while comparing the expressions')
+            pending.append((derived1, derived_key1, derived2, derived_key2,
+                            (label, word)))
+    return None
@@ -1,6 +1,7 @@
 from functools import wraps
 
 from pathex.managing.mixins import ManagerMixin
+from pathex.managing.specification import Specification
 from pathex.managing.tag import Tag
 
 __all__ = ['Concurrent']
@@ -9,6 +10,10 @@ __all__ = ['Concurrent']
 class Concurrent:
 
     def __init__(self, sync):
+        if isinstance(sync, Specification):
+            # a synchronizer for each object, that shares the specification with the other ones
+            from pathex.managing.synchronizer import Synchronizer
+            sync = Synchronizer(sync)
         self._sync = sync
         self._regions = {}
 
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable
+
+from pathex.managing.synchronizer import Synchronizer
+from pathex.managing.tag import Tag
+
+__all__ = ['SynchronizedExecutor']
+
+
+class SynchronizedExecutor:
+    """An executor of regions of a :class:`~.Synchronizer` that only gives a task to a worker thread when the task can enter its region.
+
+    Each task is submitted with the tag of its region, and it is kept in a queue for the enter label of the tag until the label is enabled by the current state of the synchronizer. Then, the label is matched without blocking and the task is run by a worker. The exit label is matched in the same way: if it is not enabled when the task finishes, the completion of the task is queued for it and the worker is released. So the workers are never blocked waiting for labels, and a small pool does not stall while the tasks that would enable the waiting ones are queued behind them, as happens with a :class:`~concurrent.futures.ThreadPoolExecutor` whose functions are decorated with :meth:`~.ManagerMixin.region`. The future of a task is done once its exit label is matched.
+
+    The executor observes the synchronizer with a :meth:`hook <.Manager.add_hook>` until its last worker finishes, so the synchronizer may also be used by threads that are not run by the executor.
+
+    >>> from pathex import Synchronizer, SynchronizedExecutor, Tag
+    >>> producer, consumer = Tag.named('producer', 'consumer')
+    >>> sync = Synchronizer((producer + consumer)+...)
+    >>> items = []
+    >>> with SynchronizedExecutor(sync, max_workers=1) as executor:
+    ...     consumed = [executor.submit(consumer, items.pop) for _ in range(3)]
+    ...     _ = [executor.submit(producer, items.append, i) for i in range(3)]
+    >>> [future.result() for future in consumed]
+    [0, 1, 2]
+
+    Args:
+        sync (Synchronizer): The synchronizer of the regions of the tasks.
+        max_workers (int | None): The maximum amount of worker threads. If it is :obj:`None`, the same default of :class:`~concurrent.futures.ThreadPoolExecutor` is used.
+    """
+
+    def __init__(self, sync: Synchronizer, max_workers: int | None = None):
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        if max_workers <= 0:
+            raise ValueError('max_workers must be greater than 0')
+        self._sync = sync
+        self._max_workers = max_workers
+        self._condition = threading.Condition()
+        # actions to be done once their labels are matched, by label, in the order the labels are to be checked
+        self._queues: OrderedDict[object, deque[Callable[[], object]]] = OrderedDict()
+        self._threads: list[threading.Thread] = []
+        self._alive = 0
+        self._shutdown = False
+        self._hooked = True
+        sync.add_hook(self._on_event)
+
+    def submit(self, tag: Tag, fn: Callable, /, *args, **kwargs) -> Future:
+        """Schedules ``fn(*args, **kwargs)`` to be run in the region marked by ``tag``, and gives a :class:`~concurrent.futures.Future` of its result."""
+        future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new tasks after shutdown')
+            self._enqueue(tag.enter, partial(self._run, tag, future, fn, args, kwargs))
+            if len(self._threads) < self._max_workers:
+                thread = threading.Thread(target=self._work, daemon=True)
+                self._threads.append(thread)
+                self._alive += 1
+                thread.start()
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stops accepting tasks. The workers finish when nothing is queued, and the last one stops observing the synchronizer.
+
+        Args:
+            wait (bool): Whether to wait until the workers finish.
+            cancel_futures (bool): Whether to cancel the tasks that have not entered their regions yet.
+        """
+        with self._condition:
+            self._shutdown = True
+            if cancel_futures:
+                for queue in self._queues.values():
+                    for action in queue:
+                        if action.func == self._run:
+                            action.args[1].cancel()
+                # the completions of the running tasks are kept, so their exit labels are matched
+                for label in list(self._queues):
+                    queue = self._queues[label]
+                    queue = deque(a for a in queue if a.func != self._run)
+                    if queue:
+                        self._queues[label] = queue
+                    else:
+                        del self._queues[label]
+            self._condition.notify_all()
+            unhook = self._alive == 0 and self._unhook()
+        if unhook:
+            self._sync.remove_hook(self._on_event)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self) -> SynchronizedExecutor:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
+
+    def _unhook(self) -> bool:
+        # gives whether the hook is to be removed, only once
+        hooked, self._hooked = self._hooked, False
+        return hooked
+
+    def _enqueue(self, label: object, action: Callable[[], object]) -> None:
+        self._queues.setdefault(label, deque()).append(action)
+        self._condition.notify()
+
+    def _on_event(self, event: str, label: object, thread_id: int, timestamp: float) -> None:
+        # the state of the synchronizer has changed, so some queued label may have been enabled
+        if event in ('matched', 'woken'):
+            with self._condition:
+                if self._queues:
+                    self._condition.notify_all()
+
+    def _pop_enabled(self) -> tuple[object, Callable[[], object]] | None:
+        for label, queue in self._queues.items():
+            if self._sync.is_enabled(label):
+                action = queue.popleft()
+                if queue:
+                    # the other labels are checked first the next time
+                    self._queues.move_to_end(label)
+                else:
+                    del self._queues[label]
+                return label, action
+        return None
+
+    def _get_action(self) -> Callable[[], object] | None:
+        while True:
+            with self._condition:
+                while (item := self._pop_enabled()) is None:
+                    if self._shutdown and not self._queues:
+                        return None
+                    self._condition.wait()
+            label, action = item
+            # The synchronizer's lock is never acquired while holding the condition, because the hook acquires them in the opposite order.
+            if self._sync.try_match(label):
+                return action
+            # another thread has changed the state since the label was checked
+            with self._condition:
+                self._queues.setdefault(label, deque()).appendleft(action)
+                self._queues.move_to_end(label, last=False)
+
+    def _run(self, tag: Tag, future: Future, fn: Callable, args: tuple, kwargs: dict) -> None:
+        if not future.set_running_or_notify_cancel():
+            complete = None
+        else:
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                complete = partial(future.set_exception, e)
+            else:
+                complete = partial(future.set_result, result)
+        if self._sync.try_match(tag.exit):
+            if complete is not None:
+                complete()
+        else:
+            with self._condition:
+                self._enqueue(tag.exit, complete or (lambda: None))
+
+    def _work(self) -> None:
+        try:
+            while (action := self._get_action()) is not None:
+                action()
+        finally:
+            with self._condition:
+                self._alive -= 1
+                unhook = self._alive == 0 and self._shutdown and self._unhook()
+            if unhook:
+                self._sync.remove_hook(self._on_event)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+from typing import Hashable
+
+__all__ = ['LabelRegistry', 'LABELS']
+
+
+class LabelRegistry:
+    """It maps each distinct label to a small integer, its *id*, given in order of registration, so managers may keep the information of each label in arrays indexed by its id instead of in tables keyed by the label.
+
+    Ids are never reused, so a registry only grows. The ids of the labels of a :class:`~.Tag` are registered when it is constructed, and the ones of the labels of a :class:`~.Specification` when it is constructed.
+
+    .. testsetup::
+
+       from pathex.managing.labels import LabelRegistry
+
+    >>> registry = LabelRegistry()
+    >>> registry.get_id('a.enter'), registry.get_id('a.exit'), registry.get_id('a.enter')
+    (0, 1, 0)
+    >>> registry[1]
+    'a.exit'
+    >>> registry.find('b.enter') is None
+    True
+    >>> len(registry)
+    2
+    """
+
+    def __init__(self):
+        self._ids: dict[Hashable, int] = {}
+        self._labels: list[Hashable] = []
+        self._lock = threading.Lock()
+
+    def get_id(self, label: Hashable) -> int:
+        """Gives the id of ``label``, registering it if it is not registered yet."""
+        try:
+            return self._ids[label]
+        except KeyError:
+            with self._lock:
+                if (i := self._ids.get(label)) is None:
+                    # the label is appended before publishing its id, so ``self[i]`` never fails
+                    i = len(self._labels)
+                    self._labels.append(label)
+                    self._ids[label] = i
+                return i
+
+    def find(self, label: Hashable) -> int | None:
+        """Gives the id of ``label``, or :obj:`None` if it is not registered."""
+        return self._ids.get(label)
+
+    def __getitem__(self, i: int) -> Hashable:
+        return self._labels[i]
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+
+LABELS = LabelRegistry()
+"""The registry of the labels of every tag and specification of the process."""
@@ -1,65 +1,46 @@
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
-from collections import deque
 from contextlib import contextmanager
-from copy import copy
-from typing import Hashable, Iterator
+from time import perf_counter
+from types import MethodType
+from typing import Callable, Hashable, Iterator
 
-from pathex.adts.containers.ordered_set import OrderedSet
-from pathex.adts.singleton import singleton
 from pathex.expressions.expression import Expression
-from pathex.expressions.nary_operators.concatenation import Concatenation
-from pathex.expressions.nary_operators.intersection import Intersection
 from pathex.expressions.nary_operators.union import Union
-from pathex.expressions.terms.empty_word import EMPTY_WORD
 from pathex.machines.decomposers.decomposer import DecomposerMatch
-from pathex.machines.decomposers.extended_decomposer_compalphabet import \
-    ExtendedDecomposerCompalphabet
 from pathex.managing.mixins import ManagerMixin
+from pathex.managing.specification import EnabledLabels, Specification
 from pathex.managing.tag import Tag
 
-__all__ = ['Manager']
+__all__ = ['Manager', 'Hook']
+
+Hook = Callable[[str, object, int, float], object]
 
 
 class Manager(ManagerMixin):
     """A generic abstract manager.
     """
-    @singleton
-    class _WaitingLabelsFigure:
-        """The instance of this class is used to represent future labels to be matched with. The idea is to use an abstract replacement object that is to be concretized with the current waiting-labels expression.
-        """
-        pass
-
-    def __init__(self, expression: Expression, decomposer: DecomposerMatch | None):
-        if decomposer is None:
-            decomposer = ExtendedDecomposerCompalphabet()
-        self._waiting_labels = self._WaitingLabelsFigure()
-        self._expression: object = Intersection(
-            self._waiting_labels, expression)
-
-        class ManagerDecomposer(decomposer.__class__):
-            waiting_label: object
-            waiting_labels_figure = self._WaitingLabelsFigure()
 
-            def _waiting_labels_visitor(self, _):
-                # return a visitor to the current waiting-labels expression
-                return self.transform(
-                    Concatenation(self.waiting_label, self.waiting_labels_figure))
+    _blocking = False
+    """Whether tasks are blocked when their labels are not matched, instead of being rejected."""
 
-            @classmethod
-            def _populate_transformer(cls):
-                super()._populate_transformer()
-                cls._transform.register(self._WaitingLabelsFigure,
-                                        cls._waiting_labels_visitor)
+    # methods replaced while some hook is registered
+    _hooked_methods = ('_when_requested_match', '_when_matched',
+                       '_when_not_matched', 'match_many')
 
-        # Just in case ``machine`` has some attributes:
-        decomposer = copy(decomposer)
-
-        # Expand ``machine.branch`` with ``_waiting_labels_visitor``:
-        decomposer.__class__ = ManagerDecomposer
-
-        self._decomposer: ManagerDecomposer = decomposer
+    def __init__(self, expression: Expression | Specification,
+                 decomposer: DecomposerMatch | None):
+        if isinstance(expression, Specification):
+            if decomposer is not None:
+                raise ValueError(
+                    'the decomposer of a specification can not be replaced')
+            self._spec = expression
+        else:
+            self._spec = Specification(expression, decomposer)
+        self._expression: object = self._spec.initial_state
+        self._hooks: tuple[Hook, ...] = ()
 
     @abstractmethod
     def _when_requested_match(self, label: object) -> object: ...
@@ -71,6 +52,96 @@ class Manager(ManagerMixin):
     def _when_not_matched(self, label: object,
                           label_info: object) -> object: ...
 
+    def add_hook(self, hook: Hook) -> None:
+        """Registers a function to be called on each event of the manager, in a similar way to :func:`sys.setprofile`.
+
+        ``hook`` is called as ``hook(event, label, thread_id, timestamp)``, where ``event`` is ``'requested'`` when ``label`` is given to :meth:`match`, ``'matched'`` when ``label`` is matched, ``'blocked'`` when the task is blocked until ``label`` is matched, ``'woken'`` when the blocked task continues, and ``'rejected'`` when ``label`` is not allowed and the manager does not block. ``thread_id`` is the :func:`~threading.get_ident` of the task that gave the label and ``timestamp`` is the value of :func:`~time.perf_counter` when the event happened.
+
+        Hooks do not cost anything while none is registered, because the methods that call them are only installed in the manager while some hook is registered. While there are hooks, :meth:`match_many` matches each label by calling :meth:`match`.
+
+        >>> from pathex import Synchronizer, Tag
+        >>> a = Tag('a')
+        >>> sync = Synchronizer(+a)
+        >>> events = []
+        >>> def hook(event, label, thread_id, timestamp):
+        ...     events.append((event, label))
+        >>> sync.add_hook(hook)
+        >>> with sync.region(a):
+        ...     pass
+        >>> events
+        [('requested', 'a.enter'), ('matched', 'a.enter'), ('requested', 'a.exit'), ('matched', 'a.exit')]
+
+        >>> sync.remove_hook(hook)
+        >>> sync.match(a.enter)
+        >>> assert len(events) == 4
+
+        >>> from pathex.managing.trace_checker import TraceChecker
+        >>> checker = TraceChecker(+a)
+        >>> checker.add_hook(hook)
+        >>> checker.match(a.exit)
+        Traceback (most recent call last):
+            ...
+        AssertionError: a.exit is not allowed as first label
+        >>> events[-1]
+        ('rejected', 'a.exit')
+
+        Args:
+            hook (Hook): The function to be called.
+        """
+        if not self._hooks:
+            self._install_hooks()
+        self._hooks += (hook,)
+
+    def remove_hook(self, hook: Hook) -> None:
+        """Unregisters a function previously registered with :meth:`add_hook`.
+
+        Args:
+            hook (Hook): The function to be unregistered.
+        """
+        hooks = list(self._hooks)
+        hooks.remove(hook)
+        self._hooks = tuple(hooks)
+        if not self._hooks:
+            for name in self._hooked_methods:
+                del self.__dict__[name]
+
+    def _emit(self, event: str, label: object) -> None:
+        thread_id = threading.get_ident()
+        timestamp = perf_counter()
+        for hook in self._hooks:
+            hook(event, label, thread_id, timestamp)
+
+    def _install_hooks(self) -> None:
+        when_requested_match = self._when_requested_match
+        when_matched = self._when_matched
+        when_not_matched = self._when_not_matched
+        emit = self._emit
+
+        def hooked_when_requested_match(label):
+            emit('requested', label)
+            return when_requested_match(label)
+
+        def hooked_when_matched(label, label_info):
+            emit('matched', label)
+            return when_matched(label, label_info)
+
+        if self._blocking:
+            def hooked_when_not_matched(label, label_info):
+                emit('blocked', label)
+                r = when_not_matched(label, label_info)
+                emit('woken', label)
+                return r
+        else:
+            def hooked_when_not_matched(label, label_info):
+                emit('rejected', label)
+                return when_not_matched(label, label_info)
+
+        self._when_requested_match = hooked_when_requested_match
+        self._when_matched = hooked_when_matched
+        self._when_not_matched = hooked_when_not_matched
+        # each label must be notified to the hooks
+        self.match_many = MethodType(ManagerMixin.match_many, self)
+
     def match(self, label: Hashable) -> object:
         """This method is used to notify to the manager the presence of a given label.
 
@@ -87,20 +158,66 @@ class Manager(ManagerMixin):
             return self._when_not_matched(label, label_info)
 
     def _advance(self, label: object) -> bool:
-        new_alternatives = deque()
-        # the waiting-labels expression is setted as a sequence consisting of the current label to be matched, followed by the rest of the labels that are to be matched
-        self._decomposer.waiting_label = label
-        alts = OrderedSet([self._expression])
-        while alts:
-            exp = alts.popleft()
-            # print(exp)
-            for head, tail in self._decomposer.transform(exp):
-                if head == label:
-                    new_alternatives.append(tail)
-                elif head is EMPTY_WORD:
-                    alts.append(tail)
-        if new_alternatives:
-            self._expression = Union(new_alternatives)
+        expression = self._derive(self._expression, label)
+        if expression is None:
+            return False
+        else:
+            self._expression = expression
             return True
+
+    def enabled_labels(self) -> EnabledLabels:
+        """Gives the labels that can be matched from the current state of the manager, without matching any of them. See :meth:`.Specification.enabled_labels`.
+
+        >>> from pathex import Synchronizer, Tag
+        >>> a, b = Tag.named('a', 'b')
+        >>> sync = Synchronizer(a + b)
+        >>> assert sync.enabled_labels() == {a.enter}
+        >>> assert sync.is_enabled(a.enter) and not sync.is_enabled(b.enter)
+        >>> with sync.region(a):
+        ...     assert sync.enabled_labels() == {a.exit}
+        >>> assert sync.enabled_labels() == {b.enter}
+        """
+        return self._spec.enabled_labels(self._expression)
+
+    def is_enabled(self, label: Hashable) -> bool:
+        """Gives whether ``label`` can be matched from the current state of the manager, without matching it. It is answered from the cached enabled labels of the state, so it may be used to reject a request without blocking."""
+        return self._spec.is_enabled(label, self._expression)
+
+    @property
+    def state(self) -> object:
+        """A snapshot of the current state of the manager.
+
+        States are immutable and the state is replaced by a single assignment when a label is matched, so the snapshot may be taken without any lock and used by read-only queries such as :meth:`.Specification.allows`, while other threads keep matching labels.
+        """
+        return self._expression
+
+    @property
+    def state_size(self) -> int:
+        """The amount of alternatives of the current state of the manager.
+
+        >>> from pathex import Synchronizer, Tag
+        >>> writer, reader = Tag('writer'), Tag('reader')
+        >>> sync = Synchronizer((writer | reader//...)+...)
+        >>> for label in [reader.enter]*3 + [reader.exit]:
+        ...     sync.match(label)
+        >>> sync.state_size
+        2
+
+        Without compaction the state would have 12 alternatives:
+
+        >>> from pathex import Specification
+        >>> sync = Synchronizer(Specification((writer | reader//...)+...,
+        ...                                   compaction_threshold=float('inf')))
+        >>> for label in [reader.enter]*3 + [reader.exit]:
+        ...     sync.match(label)
+        >>> sync.state_size
+        12
+        """
+        if isinstance(self._expression, Union):
+            return len(self._expression.arguments)
         else:
-            return False
+            return 1
+
+    def _derive(self, expression: object, label: object) -> object | None:
+        """Gives the expression that results from matching ``label`` from ``expression``, or :obj:`None` if ``label`` can not be matched."""
+        return self._spec.derive(expression, label)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
-from typing import Hashable, Iterator
+from typing import Hashable, Iterable, Iterator
 
 from pathex.managing.tag import Tag
 
@@ -12,10 +12,41 @@ class ManagerMixin(ABC):
     @abstractmethod
     def match(self, label: Hashable) -> object: ...
 
+    def match_many(self, labels: Iterable[Hashable]) -> None:
+        """Notifies the given labels one after the other, in the given order.
+
+        This default implementation just calls :meth:`match` for each label. Subclasses may override it to match the whole sequence more efficiently.
+
+        Args:
+            labels (Iterable[Hashable]): The labels to check for.
+        """
+        for label in labels:
+            self.match(label)
+
     @contextmanager
     def region(self, tag: Tag) -> Iterator[ManagerMixin]:
         """Context manager to mark a piece of code as a region.
 
+        The exit label of the region is usually enabled once the region is entered, so managers may match it with a cheaper procedure. However, it may also block until the expression allows it:
+
+        >>> from threading import Thread
+        >>> from pathex import Synchronizer, Concatenation, Tag
+        >>> t, b = Tag.named('t', 'b')
+        >>> sync = Synchronizer(Concatenation(t.enter, t.enter, t.exit, b.enter, b.exit, t.exit))
+        >>> sync.match(t.enter)
+        >>> def inner():
+        ...     with sync.region(t):
+        ...         sync.match(t.exit)
+        >>> thread = Thread(target=inner)
+        >>> thread.start()
+        >>> while sync.permits(t.exit) != 1:
+        ...     pass
+        >>> with sync.region(b):
+        ...     pass
+        >>> thread.join()
+        >>> sync.permits(t.exit)
+        2
+
         Args:
             tag (Tag): A tag to mark the corresponding block with.
         """
@@ -23,7 +54,11 @@ class ManagerMixin(ABC):
         try:
             yield self
         finally:
-            self.match(tag.exit)
+            self._exit(tag)
+
+    def _exit(self, tag: Tag) -> object:
+        # notifies the end of a region
+        return self.match(tag.exit)
 
 
 class LogbookMixin(ABC):
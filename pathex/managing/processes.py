@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import threading
+import time
 import warnings
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from multiprocessing import util
 from multiprocessing.managers import BaseManager as mpBaseManager
 from multiprocessing.managers import BaseProxy as mpBaseProxy
 from multiprocessing.managers import SyncManager as mpSyncManager
-from typing import Optional, TypeVar
+from typing import Iterable, Optional, TypeVar
 
 from pathex.managing.mixins import LogbookMixin, ManagerMixin
 from pathex.managing.synchronizer import Synchronizer as peSynchronizer
 
-__all__ = ['get_mp_process_manager', 'SynchronizerProxy']
+__all__ = ['get_mp_process_manager', 'SynchronizerProxy',
+           'PipelinedSynchronizerProxy']
 
 Address = tuple[str, int]
 
@@ -17,17 +23,175 @@ Address = tuple[str, int]
 class SynchronizerProxy(mpBaseProxy, ManagerMixin, LogbookMixin):
     """This class represents is a :class:`proxy <multiprocessing.managers.BaseProxy>` to a :class:`~.Synchronizer` object."""
 
-    _exposed_ = ['match', 'region', 'requests', 'permits']
+    _exposed_ = ['match', 'match_many', 'region', 'requests', 'permits',
+                 'metrics']
 
     def match(self, label: object) -> object:
         return self._callmethod('match', (label,))
 
+    def match_many(self, labels: Iterable[object]) -> None:
+        # the whole sequence is sent in just one round trip
+        return self._callmethod('match_many', (tuple(labels),))
+
     def requests(self, label: object) -> int:
         return self._callmethod('requests', (label,))
 
     def permits(self, label: object) -> int:
         return self._callmethod('permits', (label,))
 
+    def metrics(self) -> dict[str, object]:
+        return self._callmethod('metrics')
+
+
+# time, in seconds, after which an idle delivery thread checks whether its proxy still exists
+_IDLE_TIMEOUT = 1.0
+
+# proxies with undelivered labels, so they are not collected before delivering them
+_undelivered: dict[int, PipelinedSynchronizerProxy] = {}
+
+
+def _deliver_all(proxy_ref: weakref.ref) -> None:
+    if (proxy := proxy_ref()) is not None:
+        proxy._deliver_all()
+
+
+def _delivery_loop(proxy_ref: weakref.ref, needed: threading.Event) -> None:
+    # The proxy is only referenced while delivering, so the thread does not keep it alive.
+    while True:
+        if not needed.wait(_IDLE_TIMEOUT):
+            if proxy_ref() is None:
+                return
+            continue
+        if (proxy := proxy_ref()) is None:
+            return
+        # gives the chance of sending the labels along with the next call
+        time.sleep(proxy.flush_delay)
+        needed.clear()
+        proxy._deliver_pending()
+        del proxy
+
+
+class PipelinedSynchronizerProxy(SynchronizerProxy):
+    """This class is a :class:`SynchronizerProxy` that sends the exit labels of the regions asynchronously.
+
+    The exit label of a region is not sent when the region ends. Instead, it is delivered in the same message of the next call made by the same thread, or in the background if no call is made in the following :attr:`flush_delay` seconds. Several pending labels of the same thread are delivered in just one message. So each region costs about one round trip to the server instead of two.
+
+    Labels are delivered in the order they were given by each thread. The labels of different threads are delivered in different messages, by a pool of delivery threads, so a label that blocks does not delay the labels of the other threads. Only the next call of the thread that gave it waits for its delivery. An exception raised while delivering labels in the background is raised by the next call made through the proxy.
+
+    This mode is intended for specifications whose exit labels do not block, which is the case of most of them. Otherwise, a blocked delivery keeps a delivery thread busy until the label is matched.
+    """
+
+    flush_delay: float = 0.001
+    """Time, in seconds, that the background thread waits before delivering pending labels."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_pipeline()
+        util.register_after_fork(self, PipelinedSynchronizerProxy._init_pipeline)
+        # Pending labels must be delivered before the reference to the referent is released. The finalizer is discarded when the proxy is collected, which does not happen while it has undelivered labels.
+        util.Finalize(self, _deliver_all, (weakref.ref(self),),
+                      exitpriority=20)
+
+    def _init_pipeline(self) -> None:
+        # the labels pending in the parent are not delivered by a forked child
+        _undelivered.pop(id(self), None)
+        self._pending: dict[int, list[object]] = {}  # labels of each thread
+        self._pending_lock = threading.Lock()
+        # the last delivery of the labels of each thread
+        self._in_flight: dict[int, Future] = {}
+        self._delivery_needed = threading.Event()
+        self._error: Exception | None = None
+        self._deliverer: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _exit(self, tag) -> None:
+        with self._pending_lock:
+            self._pending.setdefault(threading.get_ident(), []).append(tag.exit)
+            _undelivered[id(self)] = self
+            if self._deliverer is None:
+                self._deliverer = threading.Thread(
+                    target=_delivery_loop,
+                    args=(weakref.ref(self), self._delivery_needed),
+                    daemon=True)
+                self._deliverer.start()
+        self._delivery_needed.set()
+
+    def _deliver(self, labels: tuple) -> None:
+        try:
+            super().match_many(labels)
+        except Exception as e:
+            self._error = e
+
+    def _deliver_pending(self) -> None:
+        needed = self._delivery_needed
+        with self._pending_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    thread_name_prefix='pathex-delivery')
+            self._in_flight = {ident: future for ident, future in self._in_flight.items()
+                               if not future.done()}
+            for ident in list(self._pending):
+                in_flight = self._in_flight.get(ident)
+                if in_flight is not None and not in_flight.done():
+                    # they are delivered when the previous delivery of the thread finishes
+                    continue
+                future = self._executor.submit(
+                    self._deliver, tuple(self._pending.pop(ident)))
+                future.add_done_callback(lambda _: needed.set())
+                self._in_flight[ident] = future
+            if not self._pending:
+                _undelivered.pop(id(self), None)
+
+    def _deliver_all(self) -> None:
+        # used at exit, when new deliveries can not be given to the pool
+        with self._pending_lock:
+            futures = list(self._in_flight.values())
+        wait(futures)
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            _undelivered.pop(id(self), None)
+        for labels in pending.values():
+            self._deliver(tuple(labels))
+
+    def _take_pending(self) -> tuple:
+        # waits for the delivery in progress of the labels of the current thread, so labels are delivered in order
+        ident = threading.get_ident()
+        with self._pending_lock:
+            in_flight = self._in_flight.pop(ident, None)
+            labels = tuple(self._pending.pop(ident, ()))
+        if in_flight is not None:
+            wait((in_flight,))
+        if (error := self._error) is not None:
+            self._error = None
+            raise error
+        return labels
+
+    def flush(self) -> None:
+        """Delivers the pending labels of the current thread."""
+        if labels := self._take_pending():
+            super().match_many(labels)
+
+    def match(self, label: object) -> object:
+        if labels := self._take_pending():
+            return super().match_many(labels + (label,))
+        else:
+            return super().match(label)
+
+    def match_many(self, labels: Iterable[object]) -> None:
+        return super().match_many(self._take_pending() + tuple(labels))
+
+    def requests(self, label: object) -> int:
+        self.flush()
+        return super().requests(label)
+
+    def permits(self, label: object) -> int:
+        self.flush()
+        return super().permits(label)
+
+    def metrics(self) -> dict[str, object]:
+        self.flush()
+        return super().metrics()
+
 
 _T = TypeVar('_T', bound=mpBaseManager)
 
@@ -42,14 +206,20 @@ def get_mp_process_manager(module_name: Optional[str],
     If ``ensure_clean`` is ``False`` and ``warn`` is ``True`` a :class:`~.RuntimeWarning` will be emitted instead.
     If ``ensure_clean`` is ``False`` and ``warn`` is ``False`` no error or warning will be emitted.
     If ``warn`` is ``True`` and ``authkey`` is ``None``, a :class:`~.RuntimeWarning` will be emitted.
+
+    The returned manager constructs :class:`~.Synchronizer` objects through ``manager.Synchronizer``, which gives a :class:`SynchronizerProxy`, or through ``manager.PipelinedSynchronizer``, which gives a :class:`PipelinedSynchronizerProxy`.
     """
     class ProcessManager(manager_class):
         Synchronizer: type[peSynchronizer]
+        PipelinedSynchronizer: type[peSynchronizer]
 
     if module_name == '__main__':
         ProcessManager.register(typeid='Synchronizer',
                                 proxytype=SynchronizerProxy,
                                 callable=peSynchronizer)
+        ProcessManager.register(typeid='PipelinedSynchronizer',
+                                proxytype=PipelinedSynchronizerProxy,
+                                callable=peSynchronizer)
         manager = ProcessManager(address=address, authkey=authkey)
         manager.start()
     else:
@@ -65,6 +235,8 @@ def get_mp_process_manager(module_name: Optional[str],
 
         ProcessManager.register(typeid='Synchronizer',
                                 proxytype=SynchronizerProxy)
+        ProcessManager.register(typeid='PipelinedSynchronizer',
+                                proxytype=PipelinedSynchronizerProxy)
         manager = ProcessManager(address=address, authkey=authkey)
         manager.connect()
 
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import multiprocessing
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from typing import Hashable, Iterable
+
+from pathex.expressions.expression import Expression
+from pathex.machines.decomposers.decomposer import DecomposerMatch
+from pathex.managing.automaton import MAX_STATES, NO_TRANSITION, get_labels
+from pathex.managing.manager import Manager
+from pathex.managing.mixins import LogbookMixin
+from pathex.managing.specification import Specification
+from pathex.managing.tag import Tag
+
+__all__ = ['SharedSynchronizer']
+
+# Layout of the shared array: the current state, followed by the waiting count, the requests and the permits of each label.
+_STATE = 0
+_WAITING = 1
+
+
+def _close(shm: SharedMemory, array: memoryview, unlink: bool) -> None:
+    # the view must be released before closing the shared memory
+    array.release()
+    shm.close()
+    if unlink:
+        shm.unlink()
+
+
+class SharedSynchronizer(Manager, LogbookMixin):
+    """This class is a synchronizer for processes of the same host that does not need a server process.
+
+    The expression is compiled to an :class:`~.Automaton` when the synchronizer is constructed, or taken from ``exp`` if it is a :class:`~.Specification` that already compiled it. The current state of the automaton and the counters of each label are placed in :mod:`shared memory <multiprocessing.shared_memory>`, and the blocking is done with process-shared locks and semaphores, so each :meth:`match` is done at memory speed, instead of being a round trip to a :mod:`manager <multiprocessing.managers>` server.
+
+    Only the labels of the expression (or the ones given in ``labels``) can be matched, and the expression must have a finite amount of states, so expressions like ``a//...`` are not supported.
+
+    As the underlying locks, a synchronizer can only be shared with other processes through inheritance, that is, as an argument of :class:`~multiprocessing.Process`, as an ``initargs`` of a pool, or as a global variable when using the ``fork`` start method.
+
+    >>> import multiprocessing
+    >>> from pathex import SharedSynchronizer, Concatenation as C
+
+    >>> exp = +C('Pi','Pf','Ci','Cf')
+    >>> sync = SharedSynchronizer(exp)
+
+    >>> def producer(sync):
+    ...     sync.match('Pi')
+    ...     sync.match('Pf')
+
+    >>> def consumer(sync):
+    ...     sync.match_many(('Ci', 'Cf'))
+
+    >>> ctx = multiprocessing.get_context('fork')
+    >>> processes = [ctx.Process(target=consumer, args=(sync,)) for _ in range(4)]
+    >>> processes += [ctx.Process(target=producer, args=(sync,)) for _ in range(4)]
+    >>> for p in processes:
+    ...     p.start()
+    >>> for p in processes:
+    ...     p.join()
+
+    >>> assert sync.requests('Pi') == sync.permits('Pf') == sync.requests('Ci') == sync.permits('Cf') == 4
+
+    >>> sync.match('WrongTag')
+    Traceback (most recent call last):
+        ...
+    ValueError: 'WrongTag' can not be matched by the synchronizer
+
+    >>> sync.close()
+
+    Args:
+        exp (Expression | Specification): The expression that specifies the allowed traces, or a specification shared with other managers.
+        decomposer (DecomposerMatch | None): The decomposer used to compile the expression. It must be :obj:`None` if ``exp`` is a :class:`~.Specification`.
+        labels (Iterable[Hashable] | None): The labels to be matched. If it is :obj:`None` the labels that appear in ``exp`` are used.
+        max_states (int): The maximum amount of states of the compiled automaton.
+        context (multiprocessing.context.BaseContext | None): The context used to construct the locks and semaphores. If it is :obj:`None` the default context is used.
+    """
+
+    _blocking = True
+
+    def __init__(self, exp: Expression | Specification,
+                 decomposer: DecomposerMatch | None = None,
+                 labels: Iterable[Hashable] | None = None,
+                 max_states: int = MAX_STATES,
+                 context=None):
+        super().__init__(exp, decomposer)
+        if labels is None:
+            labels = get_labels(self._spec.expression)
+        if context is None:
+            context = multiprocessing.get_context()
+        self._automaton = self._spec.compile(labels, max_states)
+        length = len(self._automaton.labels)
+        shm = SharedMemory(create=True, size=(1 + 3*length)*8)
+        self._sync_lock = context.Lock()
+        self._semaphores = tuple(context.Semaphore(0) for _ in range(length))
+        self._attach(shm, True)
+
+    def _attach(self, shm: SharedMemory, owner: bool) -> None:
+        length = len(self._automaton.labels)
+        self._shm = shm
+        self._array = shm.buf.cast('q')
+        self._requests = _WAITING + length
+        self._permits = _WAITING + 2*length
+        self._finalizer = weakref.finalize(
+            self, _close, shm, self._array, owner)
+
+    def __getstate__(self):
+        # the decomposer and the expression are not needed once the automaton is compiled
+        return self._automaton, self._shm.name, self._sync_lock, self._semaphores
+
+    def __setstate__(self, state):
+        self._automaton, name, self._sync_lock, self._semaphores = state
+        self._hooks = ()
+        self._attach(SharedMemory(name), False)
+
+    def close(self) -> None:
+        """Releases the shared memory. The process that constructed the synchronizer also destroys it, so it must be the last one to close it."""
+        self._finalizer()
+
+    def _index(self, label: object) -> int:
+        try:
+            return self._automaton.index[label]
+        except KeyError:
+            raise ValueError(
+                f'{label!r} can not be matched by the synchronizer') from None
+
+    def match_many(self, labels: Iterable[Hashable]) -> None:
+        """Matches the given labels as :meth:`.Synchronizer.match_many` does."""
+        indexes = [self._index(label) for label in labels]
+        array = self._array
+        self._sync_lock.acquire()
+        advanced = False
+        for i in indexes:
+            array[self._requests + i] += 1
+            matched = self._step(i)
+            if not matched and advanced:
+                # the tasks woken by the labels already matched may enable this one
+                self._check_waiting_labels()
+                advanced = False
+                matched = self._step(i)
+            if matched:
+                array[self._permits + i] += 1
+                advanced = True
+            else:
+                self._wait(i)
+                self._sync_lock.acquire()
+        if advanced:
+            self._check_waiting_labels()
+        self._sync_lock.release()
+
+    def _exit(self, tag: Tag) -> None:
+        # As in Synchronizer, the exit label is first tried with a single transition, and only if it is not enabled the whole procedure of match is done.
+        if self._hooks:
+            return self.match(tag.exit)
+        i = self._index(tag.exit)
+        array = self._array
+        self._sync_lock.acquire()
+        if self._step(i):
+            array[self._requests + i] += 1
+            array[self._permits + i] += 1
+            self._check_waiting_labels()
+            self._sync_lock.release()
+        else:
+            self._sync_lock.release()
+            self.match(tag.exit)
+
+    def _step(self, i: int) -> bool:
+        array = self._array
+        target = self._automaton.transitions[array[_STATE]][i]
+        if target == NO_TRANSITION:
+            return False
+        else:
+            array[_STATE] = target
+            return True
+
+    def _advance(self, label: object) -> bool:
+        return self._step(self._automaton.index[label])
+
+    def _wait(self, i: int) -> None:
+        # The semaphore keeps any release done between both operations, so no wakeup is missed.
+        self._array[_WAITING + i] += 1
+        self._sync_lock.release()
+        self._semaphores[i].acquire()
+
+    def _when_requested_match(self, label: object) -> int:
+        i = self._index(label)
+        self._sync_lock.acquire()  # protect the entire procedure
+        self._array[self._requests + i] += 1
+        return i
+
+    def _when_matched(self, label: object, label_info: int) -> None:
+        self._check_waiting_labels()
+        self._array[self._permits + label_info] += 1
+        self._sync_lock.release()
+
+    def _when_not_matched(self, label: object, label_info: int) -> None:
+        self._wait(label_info)
+
+    def _check_waiting_labels(self):
+        # only the labels enabled by the current state are checked
+        array = self._array
+        transitions = self._automaton.transitions
+        enabled = self._automaton.enabled
+        while True:
+            state = array[_STATE]
+            for i in enabled[state]:
+                if array[_WAITING + i] > 0:
+                    array[_STATE] = transitions[state][i]
+                    array[_WAITING + i] -= 1
+                    array[self._permits + i] += 1
+                    self._semaphores[i].release()
+                    break
+            else:
+                break
+
+    def enabled_labels(self) -> frozenset:
+        """Gives the labels of the automaton that can be matched from its current state, without matching any of them.
+
+        >>> from pathex import SharedSynchronizer, Tag
+        >>> a, b = Tag.named('a', 'b')
+        >>> sync = SharedSynchronizer(a + b)
+        >>> sync.match_many([a.enter, a.exit])
+        >>> assert sync.enabled_labels() == {b.enter}
+        >>> assert sync.is_enabled(b.enter) and not sync.is_enabled(a.enter)
+        >>> sync.close()
+        """
+        labels = self._automaton.labels
+        return frozenset(labels[i] for i in self._automaton.enabled[self._array[_STATE]])
+
+    def is_enabled(self, label: Hashable) -> bool:
+        """Gives whether ``label`` can be matched from the current state of the automaton, without matching it."""
+        if (i := self._automaton.index.get(label)) is None:
+            return False
+        return self._automaton.transitions[self._array[_STATE]][i] != NO_TRANSITION
+
+    @property
+    def state(self) -> int:
+        """The current state of the automaton, read from the shared memory, so it is the same in every process that shares the synchronizer.
+
+        Unlike the state of other managers, it is not an expression but the number of the state in the :class:`~.Automaton`, being ``0`` the initial one.
+
+        >>> from pathex import SharedSynchronizer, Tag
+        >>> a, b = Tag.named('a', 'b')
+        >>> sync = SharedSynchronizer(+(a + b))
+        >>> sync.state
+        0
+        >>> sync.match(a.enter)
+        >>> entered = sync.state
+        >>> sync.match_many([a.exit, b.enter, b.exit, a.enter])
+        >>> assert sync.state == entered != 0 and sync.state_size == 1
+        >>> sync.close()
+        """
+        return self._array[_STATE]
+
+    @property
+    def state_size(self) -> int:
+        """The current state of the automaton is a single state, so it is always ``1``."""
+        return 1
+
+    def _get_counter(self, offset: int, label: object) -> int:
+        if (i := self._automaton.index.get(label)) is None:
+            return 0
+        with self._sync_lock:
+            return self._array[offset + i]
+
+    def requests(self, label: object) -> int:
+        return self._get_counter(self._requests, label)
+
+    def permits(self, label: object) -> int:
+        return self._get_counter(self._permits, label)
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from copy import copy
+from dataclasses import dataclass
+from functools import cache
+from typing import Hashable, Iterable
+from typing import Union as TypingUnion
+
+from pathex.adts.containers.ordered_set import OrderedSet
+from pathex.adts.singleton import singleton
+from pathex.expressions.expression import Expression
+from pathex.expressions.nary_operators.concatenation import Concatenation
+from pathex.expressions.nary_operators.intersection import Intersection
+from pathex.expressions.nary_operators.union import Union
+from pathex.expressions.terms.alphabet import ALPHABET, Alphabet
+from pathex.expressions.terms.empty_word import EMPTY_WORD
+from pathex.expressions.terms.letters_complement import LettersComplement
+from pathex.expressions.terms.term import Term
+from pathex.machines.compactor import Compactor
+from pathex.machines.decomposers.decomposer import DecomposerMatch
+from pathex.machines.decomposers.extended_decomposer_compalphabet import \
+    ExtendedDecomposerCompalphabet
+from pathex.managing.automaton import MAX_STATES, Automaton, get_labels
+from pathex.managing.labels import LABELS
+
+__all__ = ['Specification', 'EnabledLabels']
+
+CACHE_SIZE = 1024
+# States smaller than this are derived quickly enough without compacting them, and compacting larger ones keeps their size bounded in long runs.
+COMPACTION_THRESHOLD = 8
+
+EnabledLabels = TypingUnion[frozenset, Alphabet, LettersComplement]
+"""The labels enabled by a state: a :class:`frozenset` of labels, :data:`~.ALPHABET` if every label is enabled, or a :class:`~.LettersComplement` of the labels that are not enabled."""
+
+
+@singleton
+class _WaitingLabelsFigure:
+    """The instance of this class is used to represent future labels to be matched with. The idea is to use an abstract replacement object that is to be concretized with the current waiting-labels expression.
+    """
+    pass
+
+
+_WAITING_LABELS_FIGURE = _WaitingLabelsFigure()
+
+
+@dataclass(frozen=True)
+class _WaitingLabel(Term):
+    """It replaces the waiting-labels figure while a label is being matched, so the label is given to the decomposer with the expression to be decomposed, instead of through a shared attribute."""
+    label: object
+
+
+def _with_waiting_label(exp: object, waiting_label: _WaitingLabel) -> object:
+    # The figure is only found in the intersections that are the alternatives of a state, so other expressions are not visited.
+    if exp is _WAITING_LABELS_FIGURE:
+        return waiting_label
+    elif isinstance(exp, (Union, Intersection)):
+        return exp.__class__([_with_waiting_label(e, waiting_label)
+                              for e in exp.arguments])
+    else:
+        return exp
+
+
+def _without_figure(exp: object) -> object:
+    # Gives the state without the waiting-labels figure, that is, the expression of the labels still allowed.
+    if isinstance(exp, Union):
+        return Union([_without_figure(e) for e in exp.arguments])
+    elif isinstance(exp, Intersection):
+        args = [e for e in exp.arguments if e is not _WAITING_LABELS_FIGURE]
+        return args[0] if len(args) == 1 else Intersection(args)
+    else:
+        return exp
+
+
+def _contains(labels: EnabledLabels, label: object) -> bool:
+    if labels is ALPHABET:
+        return True
+    elif isinstance(labels, LettersComplement):
+        return label not in labels.letters
+    else:
+        return label in labels
+
+
+@cache
+def _get_manager_decomposer_class(cls: type[DecomposerMatch]) -> type[DecomposerMatch]:
+    # The class is constructed once for each decomposer class, so its visitors are registered only once.
+    class ManagerDecomposer(cls):
+
+        def _waiting_label_visitor(self, exp: _WaitingLabel):
+            # the waiting-labels expression is a sequence consisting of the current label to be matched, followed by the rest of the labels that are to be matched
+            return self.transform(
+                Concatenation(exp.label, _WAITING_LABELS_FIGURE))
+
+        @classmethod
+        def _populate_transformer(cls):
+            super()._populate_transformer()
+            cls._transform.register(_WaitingLabel,
+                                    cls._waiting_label_visitor)
+
+    return ManagerDecomposer
+
+
+class Specification:
+    """The compiled specification of the allowed traces of some managers.
+
+    A specification holds everything that does not depend on the current state of a manager: the expression, the decomposer used to derive it, a cache of the derivations already done and the automata compiled from it. Managers constructed from the same specification share all of it, so constructing them is cheap and they only hold their current state and their own tables of labels. This is the case of a synchronizer for each object of a class.
+
+    >>> from pathex import Specification, Synchronizer, Tag
+    >>> a = Tag('a')
+    >>> spec = Specification(+a)
+    >>> syncs = [Synchronizer(spec) for _ in range(3)]
+    >>> for sync in syncs:
+    ...     with sync.region(a):
+    ...         pass
+    >>> assert all(sync.permits(a.exit) == 1 for sync in syncs)
+    >>> spec.cache_info()
+    {'hits': 4, 'misses': 2, 'size': 2}
+
+    The decomposer is given to the specification, not to its managers:
+
+    >>> from pathex.machines.decomposers.extended_decomposer import ExtendedDecomposer
+    >>> Synchronizer(spec, ExtendedDecomposer())
+    Traceback (most recent call last):
+        ...
+    ValueError: the decomposer of a specification can not be replaced
+
+    Args:
+        expression (Expression): The expression that specifies the allowed traces.
+        decomposer (DecomposerMatch | None): The decomposer used to derive the expression. If it is :obj:`None` an instance of :class:`~.ExtendedDecomposerCompalphabet` is used.
+        cache_size (int): The maximum amount of derivations kept in the cache. The least recently used ones are discarded first.
+        compaction_threshold (int): Derived states are compacted by a :class:`~.Compactor` when they have more alternatives than this amount, so the cost of each match does not grow with duplicated or redundant alternatives. Smaller states are not compacted, as compacting them costs about as much as deriving their redundant alternatives. It may be ``float('inf')`` to never compact the states.
+    """
+
+    def __init__(self, expression: Expression,
+                 decomposer: DecomposerMatch | None = None,
+                 cache_size: int = CACHE_SIZE,
+                 compaction_threshold: int | float = COMPACTION_THRESHOLD):
+        if decomposer is None:
+            decomposer = ExtendedDecomposerCompalphabet()
+        self.expression = expression
+        self.cache_size = cache_size
+        self.compaction_threshold = compaction_threshold
+        # the ids of the labels are registered once, instead of on the first match of each one
+        for label in get_labels(expression):
+            LABELS.get_id(label)
+        self.initial_state: object = Intersection(
+            _WAITING_LABELS_FIGURE, expression)
+        self._base_decomposer = decomposer
+        # Just in case ``decomposer`` has some attributes:
+        self._decomposer = copy(decomposer)
+        # Expand ``decomposer.transform`` with ``_waiting_label_visitor``:
+        self._decomposer.__class__ = _get_manager_decomposer_class(
+            decomposer.__class__)
+        # the lock only protects the caches, derivations are done concurrently
+        self._lock = threading.Lock()
+        # derivations by the identity of the derived state and the label, with the derived state to keep its identity
+        self._derivations: OrderedDict[tuple[int, object], tuple[object, object | None]] = OrderedDict()
+        # derived states by their canonical keys, so equivalent states are represented by the same object
+        self._states: OrderedDict[object, object] = OrderedDict()
+        # enabled labels by the identity of the state, with the state to keep its identity
+        self._enabled: OrderedDict[int, tuple[object, EnabledLabels]] = OrderedDict()
+        self._automata: dict[tuple[tuple, int], Automaton] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def __getstate__(self):
+        # the caches are rebuilt where the specification is unpickled
+        return (self.expression, self._base_decomposer, self.cache_size,
+                self.compaction_threshold)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def derive(self, state: object, label: object) -> object | None:
+        """Gives the state that results from matching ``label`` from ``state``, or :obj:`None` if ``label`` can not be matched.
+
+        States are immutable and the label is given to the decomposer with the state to be decomposed, so this method may be called concurrently from many threads, even for the same state. Only the access to the cache is serialized.
+        """
+        key = (id(state), label)
+        with self._lock:
+            if (entry := self._derivations.get(key)) is not None and entry[0] is state:
+                self._derivations.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+        derived = self._derive(state, label)
+        state_key = None if derived is None else Compactor().get_key(derived)
+        with self._lock:
+            if derived is not None:
+                derived = self._intern(state_key, derived)
+            self._derivations[key] = (state, derived)
+            if len(self._derivations) > self.cache_size:
+                self._derivations.popitem(last=False)
+        return derived
+
+    def allows(self, labels: Iterable[Hashable], state: object | None = None) -> bool:
+        """Gives whether ``labels`` can be matched one after the other from ``state``, or from the initial state if it is :obj:`None`. ``state`` may be a snapshot of a manager taken with :attr:`.Manager.state`.
+
+        It does not modify any manager, so it may be called concurrently with them and with other queries.
+
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> from pathex import Specification, Synchronizer, Tag
+        >>> a, b = Tag.named('a', 'b')
+        >>> spec = Specification((a + b)+...)
+        >>> sync = Synchronizer(spec)
+        >>> sync.match(a.enter)
+        >>> traces = [[a.exit, b.enter], [b.enter], [a.exit, b.enter, b.exit, a.enter]]
+        >>> with ThreadPoolExecutor() as executor:
+        ...     list(executor.map(spec.allows, traces, [sync.state]*3))
+        [True, False, True]
+        >>> spec.allows([a.enter, a.exit, b.enter])
+        True
+        """
+        if state is None:
+            state = self.initial_state
+        for label in labels:
+            if (state := self.derive(state, label)) is None:
+                return False
+        return True
+
+    def accepts(self, labels: Iterable[Hashable], state: object | None = None) -> bool:
+        """Gives whether ``labels``, matched one after the other from ``state``, or from the initial state if it is :obj:`None`, form a complete word of the expression. Unlike :meth:`allows`, a trace that may still be continued is not accepted.
+
+        >>> from pathex import Specification, Tag
+        >>> a, b = Tag.named('a', 'b')
+        >>> spec = Specification((a + b)+...)
+        >>> spec.allows([a.enter, a.exit]), spec.accepts([a.enter, a.exit])
+        (True, False)
+        >>> spec.accepts([a.enter, a.exit, b.enter, b.exit])
+        True
+        """
+        if state is None:
+            state = self.initial_state
+        for label in labels:
+            if (state := self.derive(state, label)) is None:
+                return False
+        return self.is_final(state)
+
+    def accepts_many(self, words: Iterable[Iterable[Hashable]],
+                     state: object | None = None) -> list[bool]:
+        """Gives whether each one of ``words`` is accepted as in :meth:`accepts`. The words are placed in a trie, so each common prefix is matched only once, and the words that extend a prefix that is not allowed are rejected without matching them.
+
+        >>> from pathex import Specification
+        >>> from pathex.expressions.aliases import *
+        >>> spec = Specification(C('a', 'b', 'c') | C('a', 'b', 'd'))
+        >>> spec.accepts_many(['abc', 'abd', 'ab', 'ax', 'axyz', 'abc'])
+        [True, True, False, False, False, True]
+        """
+        if state is None:
+            state = self.initial_state
+        results = []
+        # each node of the trie is a pair of the indexes of the words that end in it and the nodes that follow it by label
+        root: tuple[list[int], dict] = ([], {})
+        for i, word in enumerate(words):
+            node = root
+            for label in word:
+                node = node[1].setdefault(label, ([], {}))
+            node[0].append(i)
+            results.append(False)
+        pending = [(root, state)]
+        while pending:
+            (indexes, children), state = pending.pop()
+            if indexes and self.is_final(state):
+                for i in indexes:
+                    results[i] = True
+            for label, child in children.items():
+                if (derived := self.derive(state, label)) is not None:
+                    pending.append((child, derived))
+        return results
+
+    def is_final(self, state: object | None = None) -> bool:
+        """Gives whether the labels matched to reach ``state``, or none if it is :obj:`None`, form a complete word of the expression, that is, whether the empty word is accepted from ``state``.
+
+        >>> from pathex import Specification
+        >>> from pathex.expressions.aliases import *
+        >>> spec = Specification(C('a', 'b')*[0, 1])
+        >>> spec.is_final(), spec.is_final(spec.derive(spec.initial_state, 'a'))
+        (True, False)
+        """
+        if state is None:
+            state = self.initial_state
+        alts = OrderedSet([_without_figure(state)])
+        visited = set(alts)
+        while alts:
+            exp = alts.popleft()
+            if exp is EMPTY_WORD:
+                return True
+            for head, tail in self._decomposer.transform(exp):
+                if head is EMPTY_WORD and tail not in visited:
+                    visited.add(tail)
+                    alts.append(tail)
+        return False
+
+    def shortest_completion(self, state: object | None = None,
+                            max_length: int | None = None) -> tuple | None:
+        """Gives one of the shortest sequences of labels that form a complete word when matched from ``state``, or from the initial state if it is :obj:`None`, or :obj:`None` if there is none of at most ``max_length`` labels. See :func:`~.shortest_word`.
+
+        It tells, for instance, what a manager stuck in ``state`` is still waiting for:
+
+        >>> from pathex import Specification, Tag
+        >>> from pathex.managing.trace_checker import TraceChecker
+        >>> a, b = Tag.named('a', 'b')
+        >>> spec = Specification(a + b//2)
+        >>> checker = TraceChecker(spec)
+        >>> checker.match(a.enter)
+        >>> spec.shortest_completion(checker.state)
+        ('a.exit', 'b.enter', 'b.exit', 'b.enter', 'b.exit')
+        """
+        from pathex.generation.counting import shortest_word
+        if state is None:
+            state = self.initial_state
+        return shortest_word(_without_figure(state), max_length, self._decomposer)
+
+    def enabled_labels(self, state: object | None = None) -> EnabledLabels:
+        """Gives the labels that can be matched from ``state``, or from the initial state if it is :obj:`None`, without matching any of them. They are computed from the heads of the decomposition of the state, so they are symbolic when the specification contains :data:`~.ALPHABET` or :class:`~.LettersComplement` terms. They are computed only once for each state kept in the cache.
+
+        >>> from pathex import Specification
+        >>> from pathex.expressions.aliases import *
+        >>> spec = Specification(C('a', 'b') | C('c', 'd'))
+        >>> sorted(spec.enabled_labels())
+        ['a', 'c']
+        >>> state = spec.derive(spec.initial_state, 'a')
+        >>> spec.enabled_labels(state)
+        frozenset({'b'})
+        >>> spec.enabled_labels(spec.derive(state, 'b'))
+        frozenset()
+        >>> spec = Specification(C('a', 'b')+...)
+        >>> sorted(spec.enabled_labels(spec.derive(spec.derive(spec.initial_state, 'a'), 'b')))
+        ['a']
+        >>> Specification(C(LC('a', 'b'), 'c') | C('b', 'd')).enabled_labels()
+        LettersComplement('a')
+        >>> Specification(C(_, 'c') | 'b').enabled_labels()
+        <ALPHABET>
+        """
+        if state is None:
+            state = self.initial_state
+        with self._lock:
+            if (entry := self._enabled.get(id(state))) is not None and entry[0] is state:
+                self._enabled.move_to_end(id(state))
+                return entry[1]
+        labels = self._get_enabled_labels(state)
+        with self._lock:
+            self._enabled[id(state)] = (state, labels)
+            if len(self._enabled) > self.cache_size:
+                self._enabled.popitem(last=False)
+        return labels
+
+    def is_enabled(self, label: Hashable, state: object | None = None) -> bool:
+        """Gives whether ``label`` can be matched from ``state``, or from the initial state if it is :obj:`None`, without matching it. It is the same as ``derive(state, label) is not None``, but it is answered from the cached :meth:`enabled_labels` of the state.
+
+        >>> from pathex import Specification
+        >>> from pathex.expressions.aliases import *
+        >>> spec = Specification(C(LC('a', 'b'), 'c') | C('b', 'd'))
+        >>> [spec.is_enabled(label) for label in 'abcd']
+        [False, True, True, True]
+        """
+        return _contains(self.enabled_labels(state), label)
+
+    def _get_enabled_labels(self, state: object) -> EnabledLabels:
+        labels = set()
+        complements = []
+        alts = OrderedSet([_without_figure(state)])
+        # the tails already reached by empty words, since, for instance, the empty word is decomposed into itself
+        visited = set(alts)
+        while alts:
+            exp = alts.popleft()
+            for head, tail in self._decomposer.transform(exp):
+                if head is EMPTY_WORD:
+                    if tail not in visited:
+                        visited.add(tail)
+                        alts.append(tail)
+                elif head is ALPHABET:
+                    return ALPHABET
+                elif isinstance(head, LettersComplement):
+                    complements.append(head.letters)
+                else:
+                    labels.add(head)
+        if complements:
+            # the union of the complements is the complement of the intersection
+            letters = frozenset.intersection(*complements) - labels
+            return LettersComplement(letters) if letters else ALPHABET
+        return frozenset(labels)
+
+    def _intern(self, key: object, state: object) -> object:
+        if (interned := self._states.get(key)) is not None:
+            self._states.move_to_end(key)
+            return interned
+        self._states[key] = state
+        if len(self._states) > self.cache_size:
+            self._states.popitem(last=False)
+        return state
+
+    def _derive(self, expression: object, label: object) -> object | None:
+        new_alternatives = deque()
+        alts = OrderedSet([_with_waiting_label(expression, _WaitingLabel(label))])
+        while alts:
+            exp = alts.popleft()
+            for head, tail in self._decomposer.transform(exp):
+                if head == label:
+                    new_alternatives.append(tail)
+                elif head is EMPTY_WORD:
+                    alts.append(tail)
+        if new_alternatives:
+            if len(new_alternatives) > self.compaction_threshold:
+                new_alternatives = Compactor().transform_alternatives(
+                    new_alternatives)
+            return Union(new_alternatives)
+        else:
+            return None
+
+    def compile(self, labels: Iterable[Hashable],
+                max_states: int = MAX_STATES) -> Automaton:
+        """Gives the :class:`~.Automaton` of the specification for the given ``labels``. It is compiled only the first time it is requested.
+
+        A :class:`ValueError` is raised if more than ``max_states`` states are found.
+        """
+        key = (tuple(OrderedSet(labels)), max_states)
+        if (automaton := self._automata.get(key)) is None:
+            automaton = self._automata[key] = Automaton.compile(
+                self.initial_state, self.derive, key[0], max_states)
+        return automaton
+
+    def cache_info(self) -> dict[str, int]:
+        """Gives the amount of derivations found in the cache (``hits``), the amount of derivations done (``misses``) and the amount of derivations currently in the cache (``size``)."""
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses,
+                    'size': len(self._derivations)}
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
 import threading
+from time import perf_counter
+from typing import Hashable, Iterable
 
 from pathex.adts.concurrency.counted_condition import CountedCondition
+from pathex.adts.concurrency.timed_lock import TimedLock
+from pathex.adts.histogram import Histogram
 from pathex.expressions.expression import Expression
 from pathex.machines.decomposers.decomposer import DecomposerMatch
+from pathex.managing.labels import LABELS
 from pathex.managing.manager import Manager
 from pathex.managing.mixins import LogbookMixin
+from pathex.managing.specification import Specification
+from pathex.managing.tag import Tag
 
 __all__ = ['Synchronizer']
 
 
 class LabelInfo(CountedCondition):
-    def __init__(self, lock):
+    def __init__(self, lock, label_id: int):
         super().__init__(lock)
+        self.label_id = label_id
         self._requests = 0
         self._permits = 0
 
@@ -33,11 +41,48 @@ class LabelInfo(CountedCondition):
         with self:
             self._permits += 1
 
+    def inc_matched(self):
+        # a request matched without blocking
+        with self:
+            self._requests += 1
+            self._permits += 1
+
     def notify(self) -> None:
         super().notify()
         self._permits += 1
 
 
+class TimedLabelInfo(LabelInfo):
+    """A :class:`LabelInfo` that also measures how much time the requests of the label are blocked."""
+
+    def __init__(self, lock, label_id: int):
+        super().__init__(lock, label_id)
+        self.wait_times = Histogram()
+        self._wakeups = 0
+
+    def inc_permits(self):
+        with self:
+            self._permits += 1
+            # the label has been matched without blocking
+            self.wait_times.add(0.0)
+
+    def inc_matched(self):
+        with self:
+            self._requests += 1
+            self._permits += 1
+            self.wait_times.add(0.0)
+
+    def wait(self) -> bool:
+        start = perf_counter()
+        r = super().wait()
+        self.wait_times.add(perf_counter() - start)
+        return r
+
+    def notify(self) -> None:
+        super().notify()
+        self._wakeups += 1
+
+
 class Synchronizer(Manager, LogbookMixin):
     """This class is a manager that controls the execution of its registered threads.
 
@@ -110,10 +155,7 @@ class Synchronizer(Manager, LogbookMixin):
         ...     _ = executor.submit(func_b)
         ...     _ = executor.submit(func_a)
 
-        >>> from pathex.adts.util import SET_OF_TUPLES
-        >>> allowed_paths = exp.get_language(SET_OF_TUPLES)
-
-        >>> assert tuple(shared_list) in allowed_paths
+        >>> assert exp.accepts(shared_list)
 
     Example using :meth:`region` as a function decorator::
 
@@ -151,10 +193,7 @@ class Synchronizer(Manager, LogbookMixin):
         ...     _ = executor.submit(func_b)
         ...     _ = executor.submit(func_a)
 
-        >>> from pathex.adts.util import SET_OF_TUPLES
-        >>> allowed_paths = exp.get_language(SET_OF_TUPLES)
-
-        >>> assert tuple(shared_list) in allowed_paths
+        >>> assert exp.accepts(shared_list)
 
     Example using :meth:`region` as a method decorator::
 
@@ -201,10 +240,7 @@ class Synchronizer(Manager, LogbookMixin):
         ...     _ = executor.submit(shared.func_b)
         ...     _ = executor.submit(shared.func_a)
 
-        >>> from pathex.adts.util import SET_OF_TUPLES
-        >>> allowed_paths = shared.exp.get_language(SET_OF_TUPLES)
-
-        >>> assert tuple(shared) in allowed_paths
+        >>> assert shared.exp.accepts(shared)
 
     Example of *readers* and *writers* threads:
 
@@ -245,13 +281,27 @@ class Synchronizer(Manager, LogbookMixin):
         >>> assert shared_buffer == deque([3, 3, 3, 3, 3, 4, 4, 4, 4, 4])
     """
 
-    def __init__(self, exp: Expression,
+    _blocking = True
+
+    def __init__(self, exp: Expression | Specification,
                  decomposer: DecomposerMatch | None = None,
-                 lock_class=threading.Lock):
+                 lock_class=threading.Lock,
+                 collect_metrics: bool = False):
         super().__init__(exp, decomposer)
         self._lock_class = lock_class
-        self._sync_lock = lock_class()
-        self._labels: dict[object, LabelInfo] = {}
+        # the information of each label requested from this synchronizer, by the id of the label in LABELS, so its size does not depend on the labels of other synchronizers
+        self._labels: dict[int, LabelInfo] = {}
+        # amount of blocked tasks by the id of each label that has some, so only those labels are checked when the state changes
+        self._waiting: dict[int, int] = {}
+        if collect_metrics:
+            self._sync_lock = TimedLock(lock_class())
+            self._label_info_class = TimedLabelInfo
+            self._advance_times: Histogram | None = Histogram()
+            self._advance = self._timed_advance
+        else:
+            self._sync_lock = lock_class()
+            self._label_info_class = LabelInfo
+            self._advance_times = None
 
     match = Manager.match
     """This method is used to wait for the availability of a single label.
@@ -266,11 +316,136 @@ class Synchronizer(Manager, LogbookMixin):
         label (object): The label to wait for.
     """
 
+    def match_many(self, labels: Iterable[Hashable]) -> None:
+        """This method is used to wait for the availability of a sequence of labels.
+
+        The labels are matched one after the other under a single acquisition of the synchronizer's lock, and the waiting tasks are checked only once after the whole sequence has been matched. So, the sequence is atomic: labels from other tasks can only be interleaved where some label of the sequence is not available. In that case the execution is blocked as in :meth:`match` until the label becomes available, and then the rest of the sequence is matched.
+
+        >>> from threading import Thread
+        >>> from pathex import Synchronizer, Tag
+
+        >>> a, b, c = Tag.named('a', 'b', 'c')
+        >>> sync = Synchronizer(a + c + b)
+
+        >>> t = Thread(target=sync.match_many,
+        ...            args=([a.enter, a.exit, b.enter, b.exit],))
+        >>> t.start()
+        >>> with sync.region(c):
+        ...     pass
+        >>> t.join()
+
+        >>> assert sync.permits(b.exit) == sync.permits(c.exit) == 1
+
+        A label of the sequence may be enabled by a task woken by the previous labels of the sequence:
+
+        >>> from pathex import Concatenation
+        >>> sync = Synchronizer(+Concatenation(a.enter, b.enter, b.exit, a.exit))
+        >>> sync.match(a.enter)
+        >>> t = Thread(target=sync.match, args=(a.exit,))
+        >>> t.start()
+        >>> while sync.metrics()['labels'].get(a.exit, {}).get('waiting') != 1:
+        ...     pass
+        >>> sync.match_many([b.enter, b.exit, a.enter])
+        >>> t.join()
+        >>> assert sync.permits(a.enter) == 2
+
+        Args:
+            labels (Iterable[Hashable]): The labels to wait for.
+        """
+        self._sync_lock.acquire()
+        advanced = False
+        for label in labels:
+            label_info = self._request(label)
+            matched = self._advance(label)
+            if not matched and advanced:
+                # the tasks woken by the labels already matched may enable this one
+                self._check_waiting_labels()
+                advanced = False
+                matched = self._advance(label)
+            if matched:
+                label_info.inc_permits()
+                advanced = True
+            else:
+                self._wait(label_info)
+                self._sync_lock.acquire()
+        if advanced:
+            self._check_waiting_labels()
+        self._sync_lock.release()
+
+    def try_match(self, label: Hashable) -> bool:
+        """Matches ``label`` only if it is enabled by the current state, and gives whether it was matched. The task is never blocked, besides waiting for the synchronizer's lock, and the request is only counted if the label is matched.
+
+        >>> from pathex import Synchronizer, Tag
+        >>> a, b = Tag.named('a', 'b')
+        >>> sync = Synchronizer(a + b)
+        >>> sync.try_match(b.enter), sync.try_match(a.enter)
+        (False, True)
+        >>> sync.requests(b.enter), sync.requests(a.enter)
+        (0, 1)
+
+        Args:
+            label (Hashable): The label to match.
+        """
+        self._sync_lock.acquire()
+        if self._advance(label):
+            self._when_matched(label, self._request(label))
+            return True
+        else:
+            self._sync_lock.release()
+            return False
+
+    def _exit(self, tag: Tag) -> None:
+        # Exits are usually enabled once the region was entered, so the exit label is first tried with a single transition, counting the request and the permit at once and checking only the labels that have blocked tasks. Only if it is not enabled, the whole blocking procedure of match is done.
+        if self._hooks:
+            # each event must be notified to the hooks
+            return self.match(tag.exit)
+        label = tag.exit
+        self._sync_lock.acquire()
+        if self._advance(label):
+            self._get_label_info(tag.exit_id).inc_matched()
+            if self._waiting:
+                self._check_waiting_labels()
+            self._sync_lock.release()
+        else:
+            self._sync_lock.release()
+            self.match(label)
+
+    def _get_label_info(self, label_id: int) -> LabelInfo:
+        if (label_info := self._labels.get(label_id)) is None:
+            label_info = self._labels[label_id] = \
+                self._label_info_class(self._lock_class(), label_id)
+        return label_info
+
+    def _find_label_info(self, label: object) -> LabelInfo | None:
+        label_id = LABELS.find(label)
+        return None if label_id is None else self._labels.get(label_id)
+
+    def _request(self, label: object) -> LabelInfo:
+        label_info = self._get_label_info(LABELS.get_id(label))
+        label_info.inc_requests()
+        return label_info
+
+    def _timed_advance(self, label: object) -> bool:
+        # it replaces ``_advance`` when metrics are collected
+        start = perf_counter()
+        r = type(self)._advance(self, label)
+        self._advance_times.add(perf_counter() - start)
+        return r
+
+    def _wait(self, label_info: LabelInfo) -> None:
+        # The label's lock is acquired before releasing the procedure's protection lock, so no other task may check the waiting labels between both operations and miss this one.
+        # The blocking will be because this task being waiting for some other task, not because of the procedure's protection lock.
+        label_id = label_info.label_id
+        self._waiting[label_id] = self._waiting.get(label_id, 0) + 1
+        label_info.acquire()
+        self._sync_lock.release()
+        # lock.release must be done by another task.
+        label_info.wait()
+        label_info.release()
+
     def _when_requested_match(self, label: object) -> object:
         self._sync_lock.acquire()  # protect the entire procedure
-        label_info = self._labels.setdefault(
-            label, LabelInfo(self._lock_class()))
-        label_info.inc_requests()
+        label_info = self._request(label)
         # print(f'requested {label}')
         return label_info
 
@@ -282,38 +457,78 @@ class Synchronizer(Manager, LogbookMixin):
 
     def _when_not_matched(self, label: object, label_info: LabelInfo) -> None:
         # print(f'not_matched {label}')
-        # release the procedure's protection lock in order to get blocked in the following line, so the blocking will be because this task being waiting for some other task, not because of the procedure's protection lock
-        self._sync_lock.release()
-
-        # lock.acquire in order to block.
-        # lock.release must be done by another task.
-        with label_info:
-            label_info.wait()
+        self._wait(label_info)
 
     def _check_waiting_labels(self):
+        waiting = self._waiting
         while True:
-            for label in self._labels:
-                lock = self._labels[label]
+            for label_id in waiting:
+                lock = self._labels[label_id]
                 with lock:
                     if lock.waiting_count > 0:
-                        if self._advance(label):
+                        if self._advance(LABELS[label_id]):
                             # print(f'releasing {label}')
                             lock.notify()
                             # print(f'{label} released')
+                            if waiting[label_id] == 1:
+                                del waiting[label_id]
+                            else:
+                                waiting[label_id] -= 1
                             break
             else:
                 break
 
     def requests(self, label: object) -> int:
         with self._sync_lock:
-            if label_info := self._labels.get(label):
+            if label_info := self._find_label_info(label):
                 return label_info.get_requests()
             else:
                 return 0
 
     def permits(self, label: object) -> int:
         with self._sync_lock:
-            if label_info := self._labels.get(label):
+            if label_info := self._find_label_info(label):
                 return label_info.get_permits()
             else:
                 return 0
+
+    def metrics(self) -> dict[str, object]:
+        """Gives a snapshot of the metrics of the synchronizer.
+
+        The snapshot always contains the :attr:`~.Manager.state_size` and, for each label, the amount of requests, permits and currently waiting tasks. If the synchronizer was constructed with ``collect_metrics=True``, it also contains, for each label, the amount of tasks woken up and a :meth:`histogram <.Histogram.snapshot>` of the time the requests were blocked waiting for the label; and histograms of the time spent advancing the expression and of the time spent waiting for and holding the synchronizer's lock. So it is possible to distinguish the time a task is blocked by the expression from the time spent by the synchronizer itself.
+
+        >>> from pathex import Synchronizer, Tag
+        >>> a = Tag('a')
+        >>> sync = Synchronizer(+a, collect_metrics=True)
+        >>> with sync.region(a):
+        ...     pass
+        >>> metrics = sync.metrics()
+        >>> metrics['labels'][a.enter]['requests']
+        1
+        >>> metrics['labels'][a.enter]['wait_time']['count']
+        1
+        >>> metrics['advance_time']['count']
+        2
+        >>> sorted(metrics)
+        ['advance_time', 'labels', 'lock_hold_time', 'lock_wait_time', 'state_size']
+
+        >>> assert 'wait_time' not in Synchronizer(+a).metrics()
+        """
+        labels = {}
+        with self._sync_lock:
+            for label_info in self._labels.values():
+                with label_info:
+                    info = {'requests': label_info._requests,
+                            'permits': label_info._permits,
+                            'waiting': label_info.waiting_count}
+                    if isinstance(label_info, TimedLabelInfo):
+                        info['wakeups'] = label_info._wakeups
+                        info['wait_time'] = label_info.wait_times.snapshot()
+                labels[LABELS[label_info.label_id]] = info
+            snapshot: dict[str, object] = {'labels': labels,
+                                           'state_size': self.state_size}
+            if self._advance_times is not None:
+                snapshot['advance_time'] = self._advance_times.snapshot()
+                snapshot['lock_wait_time'] = self._sync_lock.wait_times.snapshot()
+                snapshot['lock_hold_time'] = self._sync_lock.hold_times.snapshot()
+        return snapshot
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Hashable, Iterator, Optional
 
 from pathex.expressions.nary_operators.concatenation import Concatenation
+from pathex.managing.labels import LABELS
 
 __all__ = ['Tag']
 
@@ -32,11 +33,23 @@ class Tag(Concatenation):
     "Tag('a')"
     >>> repr(b)
     "Concatenation('a.enter', 'a.exit')"
+
+    Besides its labels, a tag carries their ids in :data:`~.LABELS`, so managers do not need to look them up:
+
+    >>> from pathex.managing.labels import LABELS
+    >>> assert LABELS[a.enter_id] == a.enter and LABELS[a.exit_id] == a.exit
+
+    The ids are registered again when a tag is unpickled in another process:
+
+    >>> import pickle
+    >>> assert pickle.loads(pickle.dumps(a)).exit_id == a.exit_id
     """
 
     enter: str
     exit: str
     name: Hashable
+    enter_id: int
+    exit_id: int
 
     def __init__(self, name: Optional[Hashable] = None):
         if name is None:
@@ -51,6 +64,12 @@ class Tag(Concatenation):
 
         object.__setattr__(self, 'enter', enter)
         object.__setattr__(self, 'exit', exit)
+        object.__setattr__(self, 'enter_id', LABELS.get_id(enter))
+        object.__setattr__(self, 'exit_id', LABELS.get_id(exit))
+
+    def __reduce__(self):
+        # the ids are only valid in the registry of the current process
+        return self.__class__, (self.name,)
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({self.name!r})'
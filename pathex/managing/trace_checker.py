@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 from pathex.expressions.expression import Expression
-from pathex.machines.decomposers.extended_decomposer_compalphabet import \
-    ExtendedDecomposerCompalphabet
 from pathex.machines.decomposers.decomposer import DecomposerMatch
 from pathex.managing.manager import Manager
+from pathex.managing.specification import Specification
 
 __all__ = ['TraceChecker']
 
@@ -49,9 +48,8 @@ class TraceChecker(Manager):
     ('func_b', 'func_c')
     """
 
-    def __init__(self, expression: Expression, machine: DecomposerMatch | None = None):
-        if machine is None:
-            machine = ExtendedDecomposerCompalphabet()
+    def __init__(self, expression: Expression | Specification,
+                 machine: DecomposerMatch | None = None):
         super().__init__(expression, machine)
         self._last_seen_label = None
 
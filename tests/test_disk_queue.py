@@ -0,0 +1,35 @@
+import os
+import tempfile
+
+from pathex.adts.containers.disk_queue import DiskQueue
+
+
+def test_put_after_drained_checkpoint():
+    path = os.path.join(tempfile.mkdtemp(), 'queue.db')
+    q = DiskQueue([1, 2, 3], path, buffer_size=1)
+    assert [q.pop() for _ in range(3)] == [1, 2, 3]
+    q.checkpoint()
+    q.put(4)
+    q.put(5)
+    assert len(q) == 2
+    assert list(q) == [4, 5]
+    assert q.pop() == 4
+    q.checkpoint()
+    q.close()
+
+    q = DiskQueue(path=path, buffer_size=1)
+    assert list(q) == [5]
+    assert q.pop() == 5
+    q.checkpoint()
+    q.put(6)
+    q.checkpoint()
+    q.close()
+
+    q = DiskQueue(path=path)
+    assert len(q) == 1
+    assert q.pop() == 6
+    q.close()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    test_put_after_drained_checkpoint()
@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from pathex import Concatenation, SynchronizedExecutor, Synchronizer, Tag
+
+
+def test_readers_writers():
+    writer, reader = Tag.named('writer', 'reader')
+    sync = Synchronizer((writer | reader//...)+...)
+    lock = threading.Lock()
+    inside = {'writer': 0, 'reader': 0}
+    violations = []
+
+    def region(name):
+        with lock:
+            inside[name] += 1
+            if inside['writer'] > 1 or (inside['writer'] and inside['reader']):
+                violations.append(dict(inside))
+        with lock:
+            inside[name] -= 1
+        return name
+
+    with SynchronizedExecutor(sync, max_workers=4) as executor:
+        futures = [executor.submit(writer, region, 'writer') if i % 3 == 0
+                   else executor.submit(reader, region, 'reader')
+                   for i in range(300)]
+    assert [f.result() for f in futures].count('writer') == 100
+    assert violations == []
+    assert sync.permits(writer.exit) == 100 and sync.permits(reader.exit) == 200
+
+
+def test_small_pool_does_not_stall():
+    # with a ThreadPoolExecutor of 2 workers, the first consumers would block both workers forever
+    producer, consumer = Tag.named('producer', 'consumer')
+    sync = Synchronizer((producer + consumer)+...)
+    items = []
+    with SynchronizedExecutor(sync, max_workers=2) as executor:
+        consumed = [executor.submit(consumer, items.pop) for _ in range(50)]
+        for i in range(50):
+            executor.submit(producer, items.append, i)
+    assert sorted(f.result() for f in consumed) == list(range(50))
+
+
+def test_exits_do_not_block_workers():
+    a, b = Tag.named('a', 'b')
+    sync = Synchronizer(Concatenation(a.enter, b.enter, b.exit, a.exit))
+    with SynchronizedExecutor(sync, max_workers=1) as executor:
+        future_a = executor.submit(a, lambda: 'a')
+        future_b = executor.submit(b, lambda: 'b')
+    assert future_a.result() == 'a' and future_b.result() == 'b'
+    assert sync.permits(a.exit) == 1
+
+
+def test_labels_matched_by_other_threads():
+    producer, consumer = Tag.named('producer', 'consumer')
+    sync = Synchronizer((producer + consumer)+...)
+    executor = SynchronizedExecutor(sync, max_workers=2)
+    futures = [executor.submit(consumer, lambda: None) for _ in range(3)]
+    executor.shutdown(wait=False)
+    for _ in range(3):
+        with sync.region(producer):
+            pass
+    for future in futures:
+        future.result(timeout=10)
+    executor.shutdown()
+    assert sync._hooks == ()
+
+
+def test_exceptions_and_cancellation():
+    a, b = Tag.named('a', 'b')
+    sync = Synchronizer(+a | b)
+    executor = SynchronizedExecutor(sync, max_workers=1)
+    future = executor.submit(a, lambda: 1/0)
+    with pytest.raises(ZeroDivisionError):
+        future.result(timeout=10)
+    pending = executor.submit(b, lambda: None)
+    executor.shutdown(cancel_futures=True)
+    assert pending.cancelled()
+    with pytest.raises(RuntimeError):
+        executor.submit(a, lambda: None)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    test_readers_writers()
+    test_small_pool_does_not_stall()
+    test_exits_do_not_block_workers()
+    test_labels_matched_by_other_threads()
+    test_exceptions_and_cancellation()